@@ -2,8 +2,9 @@
 Configuration handling for chewed documentation generator
 """
 
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 from pydantic import (
     BaseModel,
     Field,
@@ -18,7 +19,9 @@ from chewed.constants import (  # Updated imports
     TEMPLATE_VERSION,
     TYPE_ALIASES,
 )
+import fnmatch
 import logging
+import re
 from importlib import resources
 
 try:
@@ -31,6 +34,13 @@ except ModuleNotFoundError:
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=32)
+def _compile_exclude_patterns(patterns: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Compile fnmatch patterns into one alternation regex"""
+    logger.debug("Compiling %d exclude patterns", len(patterns))
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns) or "(?!)")
+
+
 class chewedConfig(BaseModel):
     """Main configuration model for chewed"""
 
@@ -122,11 +132,19 @@ class chewedConfig(BaseModel):
             raise ValueError("template_dir must be a string or Path")
         return v
 
+    @property
+    def exclude_re(self) -> "re.Pattern[str]":
+        """Single matcher for exclude_patterns, compiled once per pattern set"""
+        # Derived on access, so assignment, model_copy and model_construct
+        # can never leave a stale matcher behind
+        return _compile_exclude_patterns(tuple(map(str, self.exclude_patterns)))
+
     @classmethod
     def from_toml(cls, path: Path) -> "chewedConfig":
         """Load config from TOML file"""
         logger.info(f"Loading config from TOML file: {path}")
-        config_data = tomllib.load(path)
+        with open(path, "rb", buffering=0) as f:
+            config_data = tomllib.load(f)
         logger.debug(f"Loaded raw config data: {config_data}")
         return cls(**config_data.get("tool", {}).get("chewed", {}))
 
@@ -181,7 +199,8 @@ def load_config(path: Optional[Path] = None) -> chewedConfig:
     try:
         if path and path.exists():
             logger.debug(f"Reading config file: {path}")
-            with open(path, "rb") as f:
+            # One-shot read of a small file: skip the BufferedReader layer
+            with open(path, "rb", buffering=0) as f:
                 try:
                     config_data = tomllib.load(f)
                     logger.debug(f"Loaded raw TOML data: {config_data}")
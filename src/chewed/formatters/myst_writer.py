@@ -1,17 +1,18 @@
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from chewed.utils import (
     get_annotation,
     infer_responsibilities,
     format_function_signature,
+    safe_write_many,
 )
 from chewed.config import chewedConfig
 
 import ast
 import click
 import fnmatch
-import re
 import logging
 
 from chewed.constants import META_TEMPLATE, MODULE_TEMPLATE
@@ -28,6 +29,25 @@ console_handler.setFormatter(formatter)
 logger.addHandler(console_handler)
 
 
+@lru_cache(maxsize=4096)
+def _sanitize_module_name(name: str) -> str:
+    """Cached filename stem for a dotted module name"""
+    return name.replace(".", "_").lower()
+
+
+@lru_cache(maxsize=4096)
+def _mermaid_node_name(name: str) -> str:
+    """Cached Mermaid-safe node id; dependency names recur across modules"""
+    return name.replace(".", "_").replace("-", "_")
+
+
+def _unparse_expr(node: ast.AST) -> str:
+    """Source for an annotation; bare names skip the unparse visitor"""
+    if type(node) is ast.Name:
+        return node.id
+    return ast.unparse(node)
+
+
 class MystWriter:
     def __init__(self, config: dict = None):
         self.config = config or {}
@@ -55,11 +75,11 @@ class MystWriter:
 
     def _sanitize_filename(self, name: str) -> str:
         """Sanitize module name for filename"""
-        return name.replace(".", "_").lower()
+        return _sanitize_module_name(name)
 
     def _process_examples(self, examples: List[Dict]) -> List[Dict]:
         """Process and validate examples"""
-        self.logger.debug(f"Processing {len(examples)} examples")
+        self.logger.debug("Processing %d examples", len(examples))
         valid_examples = []
         for example in examples:
             if isinstance(example, dict):
@@ -71,12 +91,12 @@ class MystWriter:
                 valid_examples.append(example)
             elif isinstance(example, str):
                 valid_examples.append({"code": example})
-        self.logger.debug(f"Processed {len(valid_examples)} valid examples")
+        self.logger.debug("Processed %d valid examples", len(valid_examples))
         return valid_examples
 
     def _format_module(self, module: dict) -> str:
         """Format module data into Myst content"""
-        self.logger.info(f"Formatting module: {module.get('name')}")
+        self.logger.info("Formatting module: %s", module.get("name"))
         
         # Basic module info
         content = [
@@ -135,9 +155,10 @@ class MystWriter:
         """Generate documentation with improved path handling and logging"""
         try:
             output_dir.mkdir(parents=True, exist_ok=True)
-            self.logger.info(f"Generating documentation in {output_dir}")
+            self.logger.info("Generating documentation in %s", output_dir)
 
-            # Generate module documentation
+            # Render every module first, then write the batch in one pass
+            pending = []
             for module in package_info.get("modules", []):
                 module_name = module.get("name", "")
                 if not module_name:
@@ -153,17 +174,24 @@ class MystWriter:
                     if "examples" in module:
                         module["examples"] = self._process_examples(module["examples"])
 
-                    # Generate content and write file
-                    content = self._format_module(module)
-                    file_path.write_text(content)
-                    self.logger.debug(f"Generated {filename}")
+                    # Generate content; files are written together below
+                    pending.append((file_path, self._format_module(module)))
                 except Exception as e:
-                    self.logger.error(f"Error generating {filename}: {str(e)}")
+                    self.logger.error("Error generating %s: %s", filename, e)
                     # Continue with other modules even if one fails
                     continue
 
+            errors = dict(safe_write_many(pending, overwrite=True))
+            for file_path, _ in pending:
+                if file_path in errors:
+                    self.logger.error(
+                        "Error generating %s: %s", file_path.name, errors[file_path]
+                    )
+                else:
+                    self.logger.debug("Generated %s", file_path.name)
+
         except Exception as e:
-            self.logger.error(f"Documentation generation failed: {str(e)}")
+            self.logger.error("Documentation generation failed: %s", e)
             raise
 
     def _format_package_index(self, package_data: Dict[str, Any]) -> str:
@@ -171,7 +199,7 @@ class MystWriter:
         package_name = package_data.get(
             "name", package_data.get("package", "Unknown Package")
         )
-        self.logger.debug(f"Formatting package index for {package_name}")
+        self.logger.debug("Formatting package index for %s", package_name)
 
         content = [
             f"# {package_name} Documentation\n",
@@ -183,7 +211,7 @@ class MystWriter:
 
         # Add module entries to toctree
         modules = package_data.get("modules", [])
-        self.logger.debug(f"Adding {len(modules)} modules to toctree")
+        self.logger.debug("Adding %d modules to toctree", len(modules))
         for mod in modules:
             module_name = mod.get("name", "") if isinstance(mod, dict) else str(mod)
             if module_name:
@@ -231,18 +259,20 @@ class MystWriter:
     def _format_role(self, module: dict) -> str:
         """Format module role description"""
         role = module.get("role", "General purpose module")
-        self.logger.debug(f"Formatting role: {role}")
+        self.logger.debug("Formatting role: %s", role)
         return f"- **Role**: {role}"
 
     def _format_architecture_layer(self, module: dict) -> str:
         """Format module architecture layer information"""
         layer = module.get("layer", "Not specified")
-        self.logger.debug(f"Formatting architecture layer: {layer}")
+        self.logger.debug("Formatting architecture layer: %s", layer)
         return f"- **Architecture Layer**: {layer}"
 
     def _format_dependencies(self, dependencies: list) -> str:
         """Format module dependencies as Mermaid graph"""
-        self.logger.debug(f"Formatting {len(dependencies) if dependencies else 0} dependencies")
+        self.logger.debug(
+            "Formatting %d dependencies", len(dependencies) if dependencies else 0
+        )
         if not dependencies:
             return "No internal dependencies"
 
@@ -259,11 +289,11 @@ class MystWriter:
 
     def _clean_node_name(self, name: str) -> str:
         """Sanitize node names for Mermaid compatibility"""
-        return name.replace(".", "_").replace("-", "_")
+        return _mermaid_node_name(name)
 
     def _format_modules(self, modules: list) -> str:
         """Format module list for index page"""
-        self.logger.debug(f"Formatting {len(modules)} modules for index")
+        self.logger.debug("Formatting %d modules for index", len(modules))
         return "\n".join(f"- [[{m['name']}]]" for m in modules)
 
     def _format_function_signature(self, func_info: dict) -> str:
@@ -302,7 +332,7 @@ class MystWriter:
 
     def _validate_example(self, example: Any) -> Optional[Dict[str, str]]:
         """Robust example validation with detailed logging"""
-        self.logger.debug(f"Validating example of type {type(example).__name__}")
+        self.logger.debug("Validating example of type %s", type(example).__name__)
         # Handle primitive types
         if isinstance(example, (str, int, float, bool)):
             return {"code": str(example)}
@@ -314,16 +344,18 @@ class MystWriter:
             if code:
                 return {"code": str(code)}
 
-            self.logger.warning(f"Skipping example: Missing 'code'/'content' field")
+            self.logger.warning("Skipping example: Missing 'code'/'content' field")
             return None
 
         # Invalid example type
-        self.logger.warning(f"Skipping invalid example type: {type(example).__name__}")
+        self.logger.warning(
+            "Skipping invalid example type: %s", type(example).__name__
+        )
         return None
 
     def _format_usage_examples(self, examples: List[Any]) -> str:
         """Format usage examples with comprehensive validation"""
-        self.logger.debug(f"Formatting {len(examples)} usage examples")
+        self.logger.debug("Formatting %d usage examples", len(examples))
         valid_examples = []
 
         for example in examples:
@@ -355,7 +387,7 @@ class MystWriter:
                             "context": self._get_code_context(child),
                         }
                 except Exception as e:
-                    self.logger.warning(f"Error extracting docstring: {str(e)}")
+                    self.logger.warning("Error extracting docstring: %s", e)
                     continue
         return docs
 
@@ -367,7 +399,7 @@ class MystWriter:
         return infer_responsibilities(module)
 
     def _format_classes(self, classes: dict) -> str:
-        self.logger.debug(f"Formatting {len(classes)} classes")
+        self.logger.debug("Formatting %d classes", len(classes))
         output = []
         for class_name, class_info in classes.items():
             output.append(f"## {class_name}\n")
@@ -387,7 +419,7 @@ class MystWriter:
 
     def _format_class(self, class_name: str, class_info: dict) -> str:
         """Format class documentation with proper cross-references"""
-        self.logger.debug(f"Formatting class: {class_name}")
+        self.logger.debug("Formatting class: %s", class_name)
         class_doc = class_info.get("doc", "No class documentation")
         methods = "\n".join(
             self._format_function(method_name, method_info)
@@ -397,7 +429,7 @@ class MystWriter:
 
     def _format_function(self, func_name: str, func_info: dict) -> str:
         """Format function with AST node handling"""
-        self.logger.debug(f"Formatting function: {func_name}")
+        self.logger.debug("Formatting function: %s", func_name)
         try:
             args = func_info.get("args", [])
             # Validate arguments type before processing
@@ -415,7 +447,9 @@ class MystWriter:
                 )
                 for arg, default in zip(args.args, defaults):
                     arg_name = arg.arg
-                    arg_type = ast.unparse(arg.annotation) if arg.annotation else "Any"
+                    arg_type = (
+                        _unparse_expr(arg.annotation) if arg.annotation else "Any"
+                    )
                     default_str = f" = {ast.unparse(default)}" if default else ""
                     arg_list.append(f"{arg_name}: {arg_type}{default_str}")
 
@@ -432,7 +466,7 @@ class MystWriter:
                 arg_str = "..."
 
             return_type = (
-                ast.unparse(returns) if isinstance(returns, ast.AST) else returns
+                _unparse_expr(returns) if isinstance(returns, ast.AST) else returns
             )
             return (
                 f"### `{func_name}({arg_str}) -> {return_type}`\n\n"
@@ -458,7 +492,9 @@ class MystWriter:
         """Generate role and architecture section"""
         role = module.get("role", "General purpose module")
         layer = module.get("architecture_layer", "Not specified")
-        self.logger.debug(f"Formatting role section - Role: {role}, Layer: {layer}")
+        self.logger.debug(
+            "Formatting role section - Role: %s, Layer: %s", role, layer
+        )
         return f"\n- **Role**: {role}\n- **Architecture Layer**: {layer}\n"
 
     # Alias for backward compatibility with tests
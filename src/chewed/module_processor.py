@@ -2,7 +2,6 @@
 from pathlib import Path
 import astroid
 from astroid import nodes
-import fnmatch
 import logging
 from typing import Dict, List, Optional, Any
 from chewed.config import chewedConfig
@@ -101,7 +100,7 @@ def _create_module_data(py_file: Path, package_path: Path, config: chewedConfig)
                 for name, alias in node.names:
                     # Convert import nodes to consistent dictionary format
                     full_path = name if isinstance(node, astroid.Import) else f"{node.module}.{name}"
-                    first_part = full_path.split('.')[0]
+                    first_part = full_path.partition('.')[0]
                     import_type = "stdlib" if first_part in stdlib_modules else "external"
                     logger.debug(f"Found import: {full_path} ({import_type})")
                     
@@ -125,14 +124,9 @@ def _create_module_data(py_file: Path, package_path: Path, config: chewedConfig)
 def _is_excluded(path: Path, config: chewedConfig) -> bool:
     """Check if path matches any exclude patterns"""
     logger.debug(f"Checking exclusion for: {path}")
-    # Ensure patterns are strings
-    exclude_patterns = [str(p) for p in config.exclude_patterns]
     str_path = str(path.resolve())
-    
-    is_excluded = any(
-        fnmatch.fnmatch(str_path, pattern)
-        for pattern in exclude_patterns
-    )
+
+    is_excluded = config.exclude_re.match(str_path) is not None
     if is_excluded:
         logger.debug(f"Path {path} matches exclude pattern")
     return is_excluded
@@ -140,35 +134,34 @@ def _is_excluded(path: Path, config: chewedConfig) -> bool:
 
 def _get_module_name(file_path: Path, package_root: Path) -> str:
     """Derive valid Python module name from file path."""
-    logger.debug(f"Getting module name for: {file_path}")
+    logger.debug("Getting module name for: %s", file_path)
     try:
         # Get relative path and convert to module notation
         relative_path = file_path.relative_to(package_root)
-        module_parts = []
-        
-        # Split path into components
-        for part in relative_path.parts:
-            if part == "__init__.py":
-                continue
-            if part.endswith(".py"):
-                part = part[:-3]
-            module_parts.append(part)
-            
-        # Handle root package __init__.py case
-        if not module_parts:
-            module_name = package_root.name if package_root.name != "src" else package_root.parent.name
-            logger.debug(f"Using root package name: {module_name}")
-            return module_name
-            
-        # Join parts with dots and clean up
-        module_name = ".".join(module_parts)
-        logger.debug(f"Derived module name: {module_name}")
-        return module_name
-        
     except ValueError as e:
-        logger.warning(f"Path {file_path} not relative to {package_root}: {e}")
+        logger.warning("Path %s not relative to %s: %s", file_path, package_root, e)
         return ""
 
+    module_parts = [
+        part[:-3] if part.endswith(".py") else part
+        for part in relative_path.parts
+        if part != "__init__.py"
+    ]
+
+    # Handle root package __init__.py case
+    if not module_parts:
+        module_name = (
+            package_root.name
+            if package_root.name != "src"
+            else package_root.parent.name
+        )
+        logger.debug("Using root package name: %s", module_name)
+        return module_name
+
+    module_name = ".".join(module_parts)
+    logger.debug("Derived module name: %s", module_name)
+    return module_name
+
 
 def _find_internal_deps(ast_tree: nodes.Module, package_name: str) -> List[str]:
     """Find internal dependencies within the package."""
@@ -194,10 +187,6 @@ def _find_imports(ast_tree: nodes.Module, package_name: str) -> List[Dict]:
     """Analyze import statements with robust dependency classification."""
     logger.debug(f"Finding imports for package: {package_name}")
     imports = []
-    stdlib_modules = {
-        "sys", "os", "re", "math", "datetime", "json",
-        "pathlib", "typing", "collections", "itertools",
-    }
 
     class ImportVisitor(NodeNG):
         def __init__(self):
@@ -218,7 +207,7 @@ def _find_imports(ast_tree: nodes.Module, package_name: str) -> List[Dict]:
 
         def _add_import(self, full_path: str, name: str):
             import_type = "external"
-            first_part = full_path.split(".")[0]
+            first_part = full_path.partition(".")[0]
 
             if first_part == package_name or full_path.startswith(f"{package_name}."):
                 import_type = "internal"
@@ -477,19 +466,22 @@ class DocProcessor:
         return imports
 
 
-# Add stdlib modules list at the bottom of the file
-stdlib_modules = {
-    "sys",
-    "os",
-    "re",
-    "math",
-    "datetime",
-    "json",
-    "pathlib",
-    "typing",
-    "collections",
-    "itertools",
-}
+# Stdlib roots recognised by import classification; a frozenset built once
+# so every lookup is a single hashed membership test
+stdlib_modules = frozenset(
+    {
+        "sys",
+        "os",
+        "re",
+        "math",
+        "datetime",
+        "json",
+        "pathlib",
+        "typing",
+        "collections",
+        "itertools",
+    }
+)
 
 
 def _process_single_file(
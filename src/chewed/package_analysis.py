@@ -1,6 +1,7 @@
 # Package analysis core logic
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
 import logging
 from typing import Any, Dict, Optional
 from .module_processor import process_modules
@@ -44,7 +45,7 @@ def analyze_package(
         # Get package name with fallback
         package_name = get_package_name(source_path)
         if not package_name or package_name in ["src", "lib"]:
-            package_name = _derive_package_name(source_path)
+            package_name = _derive_package_name(str(source_path))
 
         package_info = {
             "package": package_name,
@@ -59,17 +60,17 @@ def analyze_package(
             if not modules:
                 raise RuntimeError("No valid modules found")
             
-            validated_modules = []
-            for idx, module_data in enumerate(modules):
-                if not isinstance(module_data, dict):
-                    logger.warning(f"Invalid module data at index {idx}")
-                    continue
-                    
-                if not module_data.get("name"):
-                    logger.warning(f"Module missing name at index {idx}")
-                    continue
-                    
-                validated_modules.append(module_data)
+            validated_modules = [
+                m for m in modules if isinstance(m, dict) and m.get("name")
+            ]
+            if logger.isEnabledFor(logging.DEBUG) and len(validated_modules) != len(
+                modules
+            ):
+                for idx, module_data in enumerate(modules):
+                    if not isinstance(module_data, dict):
+                        logger.debug("Invalid module data at index %d", idx)
+                    elif not module_data.get("name"):
+                        logger.debug("Module missing name at index %d", idx)
 
             if not validated_modules:
                 raise RuntimeError("No valid modules found")
@@ -97,10 +98,11 @@ def analyze_package(
         raise RuntimeError("No valid modules found")
 
 
-def _derive_package_name(package_path: Path) -> str:
-    """Fallback package name derivation from path"""
+@lru_cache(maxsize=8192)
+def _derive_package_name(path_str: str) -> str:
+    """Fallback package name derivation from an already-resolved path"""
     try:
-        path_parts = package_path.resolve().parts
+        path_parts = Path(path_str).parts
         for part in reversed(path_parts):
             if part in ("src", "site-packages", "dist-packages"):
                 continue
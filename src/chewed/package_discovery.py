@@ -1,127 +1,157 @@
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional, Union
+from typing import Iterator, List, Dict, Union
 from .config import chewedConfig
-import fnmatch
 import re
 import os
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Directories that never hold package sources worth documenting
+_PRUNED_DIRS = frozenset(
+    {
+        "__pycache__",
+        "venv",
+        "node_modules",
+        "site-packages",
+        "dist-packages",
+    }
+)
+
+
+# perf: the name-cleaning helpers below are deliberately plain Python with
+# precompiled patterns. Do not @njit them: numba's per-call dispatch overhead
+# dominates their sub-microsecond bodies and it lacks robust str support.
+_VERSION_SUFFIX_RE = re.compile(r"[-_]v?\d+.*$")  # Match version suffix
+_SEPARATOR_RE = re.compile(r"[-_.]+")
+
+
+def _clean_name(name: str) -> str:
+    """Strip version suffix and normalize separators in a path component"""
+    return _SEPARATOR_RE.sub("_", _VERSION_SUFFIX_RE.sub("", name)).lower()
+
 
 def get_package_name(package_path: Path) -> str:
     """Robust package name extraction with version handling"""
-    version_pattern = re.compile(r"[-_]v?\d+.*$")  # Match version suffix
-
     # Clean directory name
     dir_name = package_path.name
 
     # Check parent directory if current dir is versioned
     parent = package_path.parent
-    if version_pattern.search(dir_name) and parent.name != package_path.name:
-        parent_clean = re.sub(version_pattern, "", parent.name)
+    if _VERSION_SUFFIX_RE.search(dir_name) and parent.name != dir_name:
+        parent_clean = _clean_name(parent.name)
         if parent_clean:
-            return re.sub(r"[-_.]+", "_", parent_clean).lower()
+            return parent_clean
 
     # Original cleaning logic
-    clean_name = re.sub(version_pattern, "", dir_name)
-    clean_name = re.sub(r"[-_.]+", "_", clean_name).lower()
+    clean_name = _clean_name(dir_name)
 
     # Handle parent directory if current name is generic
     if clean_name in ("src", "lib", "site-packages", "dist-packages"):
-        parent_name = package_path.parent.name
-        clean_name = re.sub(version_pattern, "", parent_name)
-        clean_name = re.sub(r"[-_.]+", "_", clean_name).lower()
+        clean_name = _clean_name(parent.name)
 
     return clean_name or "unknown_package"
 
 
-def _is_namespace_package(pkg_path: Path) -> bool:
+def _is_namespace_package(pkg_path: Union[str, Path]) -> bool:
     """Detect namespace packages more accurately"""
-    init_file = pkg_path / "__init__.py"
+    init_file = os.path.join(pkg_path, "__init__.py")
 
-    # PEP 420 namespace package
-    if not init_file.exists():
-        return True
-
-    # Check for namespace declaration
+    # Check for namespace declaration; it lives at the top of __init__.py,
+    # so a bounded byte read avoids decoding the whole file
     try:
-        content = init_file.read_text()
-        if "pkgutil" in content or "pkg_resources" in content:
-            return True
-    except UnicodeDecodeError:
-        pass
+        with open(init_file, "rb") as f:
+            head = f.read(4096)
+    except FileNotFoundError:
+        # PEP 420 namespace package
+        return True
 
-    return False
+    return b"pkgutil" in head or b"pkg_resources" in head
 
 
 def find_python_packages(
     root_path: Union[str, Path], config: chewedConfig
 ) -> List[Dict]:
     """Find Python packages in the given directory."""
-    root_path = Path(root_path).resolve()
-    if not root_path.exists():
-        raise ValueError(f"Path does not exist: {root_path}")
+    # Resolve symlinks exactly once; helpers receive the resolved root
+    root_str = os.path.realpath(root_path)
+    if not os.path.exists(root_str):
+        raise ValueError(f"Path does not exist: {root_str}")
 
     packages = []
-    logger.info(f"Scanning for Python files in {root_path}")
+    logger.info(f"Scanning for Python files in {root_str}")
+
+    # Walker paths all start with the root, so relative paths are a slice
+    root_prefix = os.path.join(root_str, "")
 
     try:
-        for path in root_path.rglob("*.py"):
+        for path_str in _iter_py_files(root_str):
             try:
-                # Convert exclude patterns to strings
-                exclude_patterns = [str(p) for p in config.exclude_patterns]
-
-                # Skip files in excluded directories
-                if any(part.startswith(".") for part in path.parts):
-                    continue
-                if any(
-                    fnmatch.fnmatch(str(path), pattern) for pattern in exclude_patterns
-                ):
+                # Skip files matching exclude patterns
+                if config.exclude_re.match(path_str):
                     continue
 
                 # Get package info
-                relative_path = path.relative_to(root_path)
-                package_name = ".".join(
-                    part for part in relative_path.parent.parts if part
-                )
+                rel_dir, file_name = os.path.split(path_str[len(root_prefix):])
+                package_name = rel_dir.replace(os.sep, ".")
 
-                if path.name == "__init__.py":
+                if file_name == "__init__.py":
                     if package_name:
                         packages.append(
                             {
                                 "name": package_name,
-                                "path": str(path.parent),
+                                "path": os.path.dirname(path_str),
                                 "type": "package",
                             }
                         )
                 else:
-                    module_name = path.stem
+                    module_name = file_name[:-3]  # Strip .py
                     if package_name:
                         module_name = f"{package_name}.{module_name}"
                     packages.append(
-                        {"name": module_name, "path": str(path), "type": "module"}
+                        {"name": module_name, "path": path_str, "type": "module"}
                     )
 
             except Exception as e:
-                logger.warning(f"Failed to process {path}: {str(e)}")
+                logger.warning(f"Failed to process {path_str}: {str(e)}")
                 continue
 
     except Exception as e:
-        logger.error(f"Error scanning directory {root_path}: {str(e)}")
+        logger.error(f"Error scanning directory {root_str}: {str(e)}")
         raise
 
     if not packages:
-        logger.warning(f"No Python packages or modules found in {root_path}")
+        logger.warning(f"No Python packages or modules found in {root_str}")
 
     return packages
 
 
-def _derive_nested_package_name(pkg_dir: Path, root_path: Path) -> str:
+def _iter_py_files(root_str: str) -> Iterator[str]:
+    """Yield .py file paths under root, never descending into pruned trees"""
+    stack = [root_str]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    name = entry.name
+                    # Hidden entries and non-source trees are skipped outright
+                    if name.startswith(".") or name in _PRUNED_DIRS:
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif name.endswith(".py"):
+                        yield entry.path
+        except OSError as e:
+            logger.warning(f"Failed to scan {current}: {str(e)}")
+
+
+def _derive_nested_package_name(pkg_dir: Path, root_str: str) -> str:
     """Derive package name for nested packages with proper path handling"""
     try:
-        # Compute relative path from root using resolved paths
-        relative_path = pkg_dir.relative_to(root_path.resolve())
+        # Compute relative path from the already-resolved root
+        relative_path = pkg_dir.relative_to(root_str)
 
         # Convert path to package name
         pkg_name = ".".join(part.replace("-", "_") for part in relative_path.parts)
@@ -131,75 +161,48 @@ def _derive_nested_package_name(pkg_dir: Path, root_path: Path) -> str:
 
         return pkg_name.lower()
     except ValueError:
-        return _derive_package_name(pkg_dir)
+        return _derive_package_name(str(pkg_dir))
 
 
-def _derive_package_name(path: Path) -> str:
+@lru_cache(maxsize=8192)
+def _derive_package_name(path_str: str) -> str:
     """Derive package name from path, handling versioned directories"""
     # Remove version suffixes and normalize
-    name = path.name.split("-")[0].split("_")[0]
+    name = os.path.basename(path_str).split("-")[0].split("_")[0]
     clean_name = re.sub(r"[.-]v?\d+.*", "", name).replace("-", "_").lower()
 
     # Handle special case directories
     if clean_name in ["src", "lib", "site-packages", "dist-packages"]:
-        parent_name = path.parent.name
+        parent_name = os.path.basename(os.path.dirname(path_str))
         clean_name = re.sub(r"[.-]v?\d+.*", "", parent_name).replace("-", "_").lower()
 
     return clean_name or "unknown_package"
 
 
-def _is_package_dir(path: Path, config: chewedConfig) -> bool:
+def _is_package_dir(path: Union[str, Path], config: chewedConfig) -> bool:
     """Check if directory is a Python package"""
     # Allow namespace packages (no __init__.py) if configured
     if config.allow_namespace_packages:
         return True
     # Regular package must have __init__.py
-    return (path / "__init__.py").exists()
+    return os.path.isfile(os.path.join(path, "__init__.py"))
 
 
-def _build_full_pkg_name(pkg_path: Path, root_dir: Path) -> str:
-    """Construct full package name from path hierarchy"""
-    parts = []
-    current_path = pkg_path
+def _is_excluded(path: Union[str, Path], config: chewedConfig) -> bool:
+    """Check if an already-resolved path matches any exclude patterns"""
+    return config.exclude_re.match(os.fspath(path)) is not None
 
-    while current_path != root_dir.parent:  # Include immediate parent of root_dir
-        part = get_package_name(current_path)
-        if part and part not in parts:
-            parts.insert(0, part)
-        current_path = current_path.parent
 
-    return ".".join(parts) if parts else get_package_name(pkg_path)
-
-
-def _is_excluded(path: Path, config: chewedConfig) -> bool:
-    """Check if path matches any exclude patterns"""
-    exclude_patterns = config.exclude_patterns  # Access list directly
-    str_path = str(path.resolve())
-    return any(fnmatch.fnmatch(str_path, pattern) for pattern in exclude_patterns)
-
-
-def _is_package(path: Path, config: chewedConfig) -> bool:
+def _is_package(path: Union[str, Path], config: chewedConfig) -> bool:
     """Determine if a path is a valid Python package"""
     # Check for basic package structure
-    if not path.is_dir():  # Add this check
+    if not os.path.isdir(path):
         return False
 
-    # Check for Python files
-    has_py_files = False
-    try:
-        has_py_files = any(path.glob("*.py"))
-    except Exception as e:
-        logger.warning(f"Error checking for Python files in {path}: {str(e)}")
-        return False
-
-    if not has_py_files and not config.allow_namespace_packages:
-        return False
-
-    # Check for __init__.py if namespace packages are not allowed
-    if not config.allow_namespace_packages:
-        init_py = path / "__init__.py"
-        return init_py.exists()
+    # A single stat on __init__.py settles the common case; no directory scan
+    # is needed since an __init__.py already implies the presence of .py files
+    if os.path.isfile(os.path.join(path, "__init__.py")):
+        return True
 
-    # For namespace packages, check for __init__.py or allow empty directories
-    init_py = path / "__init__.py"
-    return init_py.exists() or config.namespace_fallback
+    # Without __init__.py only namespace packages qualify
+    return config.allow_namespace_packages and config.namespace_fallback
@@ -1,7 +1,7 @@
 # Dependency analysis and relationship mapping
-from collections import defaultdict
 from typing import List, Dict, Any
 import logging
+import sys
 
 logger = logging.getLogger(__name__)
 
@@ -9,48 +9,59 @@ logger = logging.getLogger(__name__)
 def analyze_relationships(modules: List[Dict[str, Any]], package_name: str) -> Dict[str, Any]:
     """Analyze module relationships and dependencies."""
     logger.info(f"Analyzing relationships for package: {package_name}")
-    relationships = defaultdict(list)
+    relationships = {}
+    external_deps = {}  # Ordered set: first-seen order keeps output deterministic
+    # One shared "type:source" label per distinct import across all modules
+    dep_labels = {"external": {}, "stdlib": {}}
 
     for module in modules:
         # Safely extract module name, using a fallback
         module_name = module.get('name', f"unnamed_module_{id(module)}")
-        logger.debug(f"Processing module: {module_name}")
+        logger.debug("Processing module: %s", module_name)
         
         # Track internal dependencies
         internal_deps = module.get('internal_deps', [])
-        filtered_deps = [dep for dep in internal_deps if dep.startswith(package_name)]
-        relationships[module_name].extend(filtered_deps)
-        logger.debug(f"Found {len(filtered_deps)} internal dependencies for {module_name}")
+        deps = [dep for dep in internal_deps if dep.startswith(package_name)]
+        logger.debug("Found %s internal dependencies for %s", len(deps), module_name)
 
         # Track external imports
         imports = module.get('imports', [])
-        logger.debug(f"Processing {len(imports)} imports for {module_name}")
+        logger.debug("Processing %s imports for %s", len(imports), module_name)
         
-        for imp in imports:
-            if not isinstance(imp, dict):
-                logger.warning(f"Skipping invalid import format in {module_name}")
+        # Extract (type, source) pairs in one comprehension pass
+        pairs = [
+            (imp.get('type'), imp.get('source') or imp.get('full_path') or 'unknown')
+            for imp in imports
+            if isinstance(imp, dict)
+        ]
+        if len(pairs) != len(imports):
+            logger.warning(f"Skipping invalid import format in {module_name}")
+
+        for import_type, import_source in pairs:
+            labels = dep_labels.get(import_type)
+            if labels is None:
                 continue
-            
-            import_type = imp.get('type')
-            import_source = imp.get('source', imp.get('full_path', 'unknown'))
-            
+
+            logger.debug("Found %s dependency: %s", import_type, import_source)
+            label = labels.get(import_source)
+            if label is None:
+                label = labels[import_source] = sys.intern(
+                    f"{import_type}:{import_source}"
+                )
+            deps.append(label)
             if import_type == 'external':
-                logger.debug(f"Found external dependency: {import_source}")
-                relationships[module_name].append(f"external:{import_source}")
-            elif import_type == 'stdlib':
-                logger.debug(f"Found stdlib dependency: {import_source}")
-                relationships[module_name].append(f"stdlib:{import_source}")
+                external_deps[import_source] = None
+
+        # Modules sharing a name accumulate into one entry
+        if module_name in relationships:
+            relationships[module_name].extend(deps)
+        else:
+            relationships[module_name] = deps
 
     logger.info(f"Completed relationship analysis for {len(modules)} modules")
-    external_deps = {
-        imp.get('source', imp.get('full_path', 'unknown'))
-        for module in modules
-        for imp in module.get('imports', [])
-        if isinstance(imp, dict) and imp.get('type') == 'external'
-    }
-    logger.debug(f"Found {len(external_deps)} unique external dependencies")
+    logger.debug("Found %s unique external dependencies", len(external_deps))
 
     return {
-        "dependency_graph": dict(relationships),
+        "dependency_graph": relationships,
         "external_deps": list(external_deps),
     }
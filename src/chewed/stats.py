@@ -4,13 +4,42 @@ Documentation statistics collection and reporting
 
 from pathlib import Path
 import ast
-from typing import Dict, Any
+import os
+from typing import List, Tuple, Union
 import logging
 from tabulate import tabulate
 
 logger = logging.getLogger(__name__)
 
 
+def _list_py_files(directory: Path, prefix: str = "") -> List[str]:
+    """List .py files directly inside a directory whose names start with prefix"""
+    try:
+        with os.scandir(directory) as entries:
+            return [
+                entry.path
+                for entry in entries
+                if entry.name.startswith(prefix)
+                and entry.name.endswith(".py")
+                and entry.is_file()
+            ]
+    except OSError as e:
+        logger.warning(f"Cannot list {directory}: {str(e)}")
+        return []
+
+
+def _read_bytes(path: Union[str, Path]) -> bytes:
+    """Read a file's raw bytes; the counters below never need decoded text"""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _count_in_file(path: str, needles: Tuple[bytes, ...]) -> Tuple[int, ...]:
+    """Count occurrences of each byte needle in a file without decoding it"""
+    data = _read_bytes(path)
+    return tuple(data.count(needle) for needle in needles)
+
+
 class StatsCollector:
     def __init__(self):
         logger.debug("Initializing StatsCollector")
@@ -21,7 +50,7 @@ class StatsCollector:
             "config": {"options": 0, "rules": 0},
             "coverage": {"files": 0, "lines": 0},
         }
-        logger.debug(f"Initialized metrics structure: {self.metrics}")
+        logger.debug("Initialized metrics structure: %s", self.metrics)
 
     def analyze_project(self, project_root: Path):
         """Main analysis entry point"""
@@ -34,7 +63,7 @@ class StatsCollector:
             logger.debug("chewed directory not found, using project root")
             src_dir = project_root
 
-        logger.debug(f"Analyzing source directory: {src_dir}")
+        logger.debug("Analyzing source directory: %s", src_dir)
         self._analyze_constants(src_dir / "constants.py")
         self._analyze_tests(project_root.parent / "tests")
         self._analyze_config(src_dir / "config.py")
@@ -50,20 +79,20 @@ class StatsCollector:
             return
 
         try:
-            with open(const_path) as f:
-                logger.debug("Parsing constants file")
-                tree = ast.parse(f.read())
-                const_count = sum(
-                    1
-                    for node in ast.walk(tree)
-                    if isinstance(node, ast.Assign)
-                    and any(
-                        isinstance(t, ast.Name) and t.id.isupper() for t in node.targets
-                    )
+            logger.debug("Parsing constants file")
+            tree = ast.parse(_read_bytes(const_path))
+            # Constants live at module scope; nested bodies are not visited
+            const_count = sum(
+                1
+                for node in tree.body
+                if isinstance(node, ast.Assign)
+                and any(
+                    isinstance(t, ast.Name) and t.id.isupper() for t in node.targets
                 )
-                logger.debug(f"Found {const_count} constants")
-                self.metrics["constants"]["count"] = const_count
-                self.metrics["constants"]["files"][str(const_path)] = const_count
+            )
+            logger.debug("Found %s constants", const_count)
+            self.metrics["constants"]["count"] = const_count
+            self.metrics["constants"]["files"][str(const_path)] = const_count
         except Exception as e:
             logger.error(f"Constant analysis failed: {str(e)}", exc_info=True)
 
@@ -74,16 +103,17 @@ class StatsCollector:
             logger.warning(f"Tests directory not found at {tests_dir}")
             return
 
-        for test_file in tests_dir.glob("test_*.py"):
-            logger.debug(f"Analyzing test file: {test_file}")
+        for test_file in _list_py_files(tests_dir, prefix="test_"):
+            logger.debug("Analyzing test file: %s", test_file)
             try:
-                with open(test_file) as f:
-                    content = f.read()
-                    test_cases = content.count("def test_")
-                    assertions = content.count("assert ")
-                    logger.debug(f"Found {test_cases} test cases and {assertions} assertions")
-                    self.metrics["tests"]["cases"] += test_cases
-                    self.metrics["tests"]["assertions"] += assertions
+                test_cases, assertions = _count_in_file(
+                    test_file, (b"def test_", b"assert ")
+                )
+                logger.debug(
+                    "Found %s test cases and %s assertions", test_cases, assertions
+                )
+                self.metrics["tests"]["cases"] += test_cases
+                self.metrics["tests"]["assertions"] += assertions
             except Exception as e:
                 logger.warning(f"Error analyzing test file {test_file}: {str(e)}", exc_info=True)
 
@@ -95,16 +125,17 @@ class StatsCollector:
             return
 
         try:
-            with open(config_path) as f:
-                logger.debug("Parsing config file")
-                tree = ast.parse(f.read())
+            source = _read_bytes(config_path)
+            # Cheap byte check first; only parse when the name can appear
+            options = 0
+            if b"chewedConfig" in source:
                 options = sum(
                     1
-                    for node in ast.walk(tree)
+                    for node in ast.walk(ast.parse(source))
                     if isinstance(node, ast.ClassDef) and node.name == "chewedConfig"
                 )
-                logger.debug(f"Found {options} config options")
-                self.metrics["config"]["options"] = options
+            logger.debug("Found %s config options", options)
+            self.metrics["config"]["options"] = options
         except Exception as e:
             logger.error(f"Config analysis failed: {str(e)}", exc_info=True)
 
@@ -116,17 +147,20 @@ class StatsCollector:
             return
 
         try:
-            with open(cli_path) as f:
-                content = f.read()
-                commands = content.count("@cli.command()")
-                options = content.count("@click.option")
-                arguments = content.count("@click.argument")
-                logger.debug(f"Found {commands} commands, {options} options, {arguments} arguments")
-                self.metrics["cli"] = {
-                    "commands": commands,
-                    "options": options,
-                    "arguments": arguments,
-                }
+            commands, options, arguments = _count_in_file(
+                cli_path, (b"@cli.command()", b"@click.option", b"@click.argument")
+            )
+            logger.debug(
+                "Found %s commands, %s options, %s arguments",
+                commands,
+                options,
+                arguments,
+            )
+            self.metrics["cli"] = {
+                "commands": commands,
+                "options": options,
+                "arguments": arguments,
+            }
         except Exception as e:
             logger.warning(f"Error analyzing CLI file: {str(e)}", exc_info=True)
 
@@ -138,19 +172,18 @@ class StatsCollector:
             return
 
         examples = 0
-        for ffile in formatters_dir.glob("*.py"):
-            logger.debug(f"Analyzing formatter file: {ffile}")
+        for ffile in _list_py_files(formatters_dir):
+            logger.debug("Analyzing formatter file: %s", ffile)
             try:
-                with open(ffile) as f:
-                    content = f.read()
-                    format_examples = content.count("_format_example")
-                    validate_examples = content.count("_validate_example")
-                    examples += format_examples + validate_examples
-                    logger.debug(f"Found {format_examples + validate_examples} examples")
+                format_examples, validate_examples = _count_in_file(
+                    ffile, (b"_format_example", b"_validate_example")
+                )
+                examples += format_examples + validate_examples
+                logger.debug("Found %s examples", format_examples + validate_examples)
             except Exception as e:
                 logger.warning(f"Error analyzing formatter file {ffile}: {str(e)}", exc_info=True)
         self.metrics["examples"]["total"] = examples
-        logger.debug(f"Total examples found: {examples}")
+        logger.debug("Total examples found: %s", examples)
 
     def display_stats(self):
         """Print formatted statistics table"""
@@ -165,7 +198,7 @@ class StatsCollector:
             ["Validation Examples", self.metrics["examples"]["total"]],
         ]
 
-        logger.debug(f"Prepared stats table: {stats}")
+        logger.debug("Prepared stats table: %s", stats)
         print("\n📊 Documentation Statistics:")
         print(tabulate(stats, headers=["Metric", "Count"], tablefmt="rounded_outline"))
         print("\n")
@@ -1,93 +1,105 @@
 import ast
 from chewed.config import chewedConfig
-from typing import Any, List, Tuple, Union, Optional, Dict
+from typing import Any, Iterator, List, Tuple, Union, Optional, Dict
+from functools import lru_cache
+from itertools import chain, islice, repeat
 from pathlib import Path
 import logging
 import re
 import os
+import shutil
 
 logger = logging.getLogger(__name__)
 
+# Dotted module paths (e.g. typing.List) collapse to their last component
+_ANNOTATION_RE = re.compile(r"\b(?:\w+\.)+(\w+)\b")
+
 
 def get_annotation(node: ast.AST, config: chewedConfig) -> str:
     """Simplify type annotations for documentation"""
     logger.debug("Simplifying type annotation")
     annotation = ast.unparse(node).strip()
-    logger.debug(f"Raw annotation: {annotation}")
-    # Replace full module paths with base names
-    simplified = re.sub(r"\b(\w+\.)+(\w+)\b", r"\2", annotation)
-    logger.debug(f"Simplified annotation: {simplified}")
+    logger.debug("Raw annotation: %s", annotation)
+    simplified = _simplify_annotation_str(annotation)
+    logger.debug("Simplified annotation: %s", simplified)
     return simplified
 
 
+@lru_cache(maxsize=4096)
+def _simplify_annotation_str(raw: str) -> str:
+    """Replace full module paths with base names (memoized per annotation)"""
+    return _ANNOTATION_RE.sub(r"\1", raw)
+
+
+# Nodes that can hold statements; expressions never do (match_case is 3.10+)
+_STATEMENT_NODES = (ast.stmt, ast.excepthandler) + (
+    (ast.match_case,) if hasattr(ast, "match_case") else ()
+)
+
+_RESPONSIBILITY_SECTIONS = (
+    ("classes", "Defines core classes: "),
+    ("functions", "Provides key functions: "),
+    ("constants", "Contains constants: "),
+)
+
+
 def infer_responsibilities(module: dict) -> str:
     """Generate module responsibility description based on contents"""
     logger.debug("Inferring module responsibilities")
-
-    def safe_get_names(items, key="name") -> list:
-        """Safely extract names from mixed list/dict structures"""
-        logger.debug(f"Extracting names with key '{key}' from {type(items)}")
-        if isinstance(items, dict):
-            names = [v.get(key, "") for v in items.values() if v.get(key)]
-        elif isinstance(items, list):
-            names = [item.get(key, "") for item in items if item.get(key)]
-        else:
-            names = []
-        logger.debug(f"Extracted names: {names}")
-        return names
-
-    responsibilities = []
-
-    # Handle classes
-    if classes := module.get("classes"):
-        logger.debug("Processing classes")
-        class_names = safe_get_names(classes)
-        class_list = class_names[:3]
-        resp = "Defines core classes: " + ", ".join(class_list)
-        if len(class_names) > 3:
-            resp += f" (+{len(class_names)-3} more)"
-        logger.debug(f"Added class responsibility: {resp}")
-        responsibilities.append(resp)
-
-    # Handle functions
-    if functions := module.get("functions"):
-        logger.debug("Processing functions")
-        func_names = safe_get_names(functions)
-        func_list = func_names[:3]
-        resp = "Provides key functions: " + ", ".join(func_list)
-        if len(func_names) > 3:
-            resp += f" (+{len(func_names)-3} more)"
-        logger.debug(f"Added function responsibility: {resp}")
-        responsibilities.append(resp)
-
-    # Handle constants
-    if constants := module.get("constants"):
-        logger.debug("Processing constants")
-        const_names = safe_get_names(constants)
-        const_list = const_names[:3]
-        resp = "Contains constants: " + ", ".join(const_list)
-        if len(const_names) > 3:
-            resp += f" (+{len(const_names)-3} more)"
-        logger.debug(f"Added constant responsibility: {resp}")
-        responsibilities.append(resp)
-
-    if not responsibilities:
+    sections = [
+        (prefix, items)
+        for key, prefix in _RESPONSIBILITY_SECTIONS
+        if (items := module.get(key))
+    ]
+    if not sections:
+        # Common for re-exporting __init__ modules; skip the helpers entirely
         logger.info("No specific responsibilities found")
         return "General utility module with mixed responsibilities"
 
+    def iter_names(items, key="name") -> Iterator[str]:
+        """Lazily yield non-empty names from mixed list/dict structures"""
+        logger.debug("Extracting names with key '%s' from %s", key, type(items))
+        if isinstance(items, dict):
+            items = items.values()
+        elif not isinstance(items, list):
+            return iter(())
+        return (
+            name
+            for item in items
+            if isinstance(item, dict) and (name := item.get(key))
+        )
+
+    def summarize(prefix: str, items) -> str:
+        """Name the first three items and count the rest without a full list"""
+        names = iter_names(items)
+        resp = prefix + ", ".join(islice(names, 3))
+        remaining = sum(1 for _ in names)
+        if remaining:
+            resp += f" (+{remaining} more)"
+        return resp
+
+    responsibilities = [summarize(prefix, items) for prefix, items in sections]
     result = "\n- ".join([""] + responsibilities)
-    logger.debug(f"Final responsibilities: {result}")
+    logger.debug("Final responsibilities: %s", result)
     return result
 
 
 def validate_ast(node: ast.AST) -> None:
     """Validate AST structure with enhanced assignment checking"""
     logger.debug("Starting AST validation")
-    for child in ast.walk(node):
+    # Read per call so logging configured after import (--verbose) applies
+    debug = logger.isEnabledFor(logging.DEBUG)
+    valid_targets = (ast.Name, ast.Attribute, ast.Subscript)
+    iter_child_nodes = ast.iter_child_nodes
+    stack = [node]
+    while stack:
+        child = stack.pop()
+        stack.extend(iter_child_nodes(child))
         if isinstance(child, ast.Assign):
-            logger.debug("Validating assignment node")
+            if debug:
+                logger.debug("Validating assignment node")
             for target in child.targets:
-                if not isinstance(target, (ast.Name, ast.Attribute, ast.Subscript)):
+                if not isinstance(target, valid_targets):
                     line = getattr(target, "lineno", "unknown")
                     logger.error(f"Invalid assignment target found at line {line}")
                     raise ValueError(
@@ -95,7 +107,8 @@ def validate_ast(node: ast.AST) -> None:
                     )
 
         if isinstance(child, ast.Dict):
-            logger.debug("Validating dictionary node")
+            if debug:
+                logger.debug("Validating dictionary node")
             if len(child.keys) != len(child.values):
                 line = getattr(child, "lineno", "unknown")
                 logger.error(f"Dict key/value mismatch at line {line}")
@@ -117,18 +130,23 @@ def format_function_signature(
 ) -> str:
     """Format function signature with proper argument handling"""
     logger.debug("Formatting function signature")
-    args_list = []
-    defaults = [None] * (len(args.args) - len(args.defaults)) + list(args.defaults)
-
-    for arg, default in zip(args.args, defaults):
-        logger.debug(f"Processing argument: {arg.arg}")
+    debug = logger.isEnabledFor(logging.DEBUG)
+    n_positional = len(args.args)
+    n_defaults = len(args.defaults)
+    # Defaults align with the trailing positional args
+    defaults = chain(repeat(None, n_positional - n_defaults), args.defaults)
+
+    def format_arg(arg: ast.arg, default: Optional[ast.AST]) -> str:
+        if debug:
+            logger.debug("Processing argument: %s", arg.arg)
         arg_str = arg.arg
         if arg.annotation:
             arg_str += f": {get_annotation(arg.annotation, config)}"
         if default:
-            default_src = ast.unparse(default).strip()
-            arg_str += f" = {default_src}"
-        args_list.append(arg_str)
+            arg_str += f" = {_unparse_default(default)}"
+        return arg_str
+
+    args_list = [format_arg(arg, default) for arg, default in zip(args.args, defaults)]
 
     return_str = ""
     if returns:
@@ -136,96 +154,212 @@ def format_function_signature(
         return_str = f" -> {get_annotation(returns, config)}"
 
     result = f"({', '.join(args_list)}){return_str}"
-    logger.debug(f"Final signature: {result}")
+    logger.debug("Final signature: %s", result)
     return result
 
 
+def _unparse_default(node: ast.AST) -> str:
+    """Source for a default value; plain literals hit a per-value cache"""
+    if type(node) is ast.Constant and node.kind is None:
+        # The type is part of the key so 1, 1.0 and True stay distinct
+        return _unparse_constant(type(node.value), node.value)
+    return ast.unparse(node).strip()
+
+
+@lru_cache(maxsize=4096)
+def _unparse_constant(kind: type, value: Any) -> str:
+    return ast.unparse(ast.Constant(value)).strip()
+
+
 def _find_imports(node: ast.AST) -> list:
     """Extract import statements from AST"""
     logger.debug("Starting import extraction")
     imports = []
-
-    class ImportVisitor(ast.NodeVisitor):
-        def visit_Import(self, node):
-            logger.debug("Processing Import node")
-            for alias in node.names:
-                logger.debug(f"Found import: {alias.name}")
-                imports.append(alias.name)
-
-        def visit_ImportFrom(self, node):
-            logger.debug("Processing ImportFrom node")
-            module = node.module or ""
-            for alias in node.names:
-                import_name = f"{module}.{alias.name}" if module else alias.name
-                logger.debug(f"Found import from: {import_name}")
-                imports.append(import_name)
-
-    ImportVisitor().visit(node)
-    logger.debug(f"Found {len(imports)} imports")
+    statements = 0
+
+    # Imports are statements, and expressions never contain statements, so
+    # only statement containers need descending into. Children are pushed
+    # reversed to keep source order.
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, ast.Import):
+            names = [alias.name for alias in current.names]
+        elif isinstance(current, ast.ImportFrom):
+            module = current.module or ""
+            names = [
+                f"{module}.{alias.name}" if module else alias.name
+                for alias in current.names
+            ]
+        else:
+            stack.extend(
+                child
+                for child in reversed(list(ast.iter_child_nodes(current)))
+                if isinstance(child, _STATEMENT_NODES)
+            )
+            continue
+        statements += 1
+        imports.extend(names)
+    logger.debug("Found %d imports in %d statements", len(imports), statements)
     return imports
 
 
 def extract_constant_values(node: ast.AST) -> List[Tuple[str, str]]:
     """Extract module-level constants with ALL_CAPS names"""
     logger.debug("Starting constant extraction")
+    debug = logger.isEnabledFor(logging.DEBUG)
     constants = []
     for stmt in node.body:
-        if isinstance(stmt, ast.Assign):
-            for target in stmt.targets:
-                if isinstance(target, ast.Name) and target.id.isupper():
-                    value = ast.unparse(stmt.value).strip()
-                    logger.debug(f"Found constant: {target.id} = {value}")
-                    constants.append((target.id, value))
-    logger.debug(f"Extracted {len(constants)} constants")
+        if not isinstance(stmt, ast.Assign):
+            continue
+        names = [
+            t.id for t in stmt.targets if isinstance(t, ast.Name) and t.id.isupper()
+        ]
+        if not names:
+            continue
+        # One unparse per statement, shared by chained targets (A = B = ...)
+        value = ast.unparse(stmt.value).strip()
+        if debug:
+            logger.debug("Found constants: %s = %s", ", ".join(names), value)
+        constants.extend((name, value) for name in names)
+    logger.debug("Extracted %d constants", len(constants))
     return constants
 
 
 def safe_write(
-    path: Path, content: str, mode: str = "w", overwrite: bool = False
+    path: Path, content: Union[str, bytes], mode: str = "w", overwrite: bool = False
 ) -> None:
     """Atomic file write with directory creation"""
-    logger.debug(f"Attempting to write to {path}")
-    if path.exists() and not overwrite:
-        logger.error(f"Cannot write: {path} exists and overwrite=False")
-        raise FileExistsError(f"File already exists: {path}")
-
-    logger.debug("Creating parent directories if needed")
-    path.parent.mkdir(parents=True, exist_ok=True)
-    logger.debug(f"Writing content in mode '{mode}'")
-    with open(path, mode) as f:
-        f.write(content)
+    logger.debug("Attempting to write to %s", path)
+    path_str = os.fspath(path)
+    data = _as_bytes(content)
+    if "a" in mode:
+        if not overwrite and os.path.exists(path_str):
+            logger.error(f"Cannot write: {path} exists and overwrite=False")
+            raise FileExistsError(f"File already exists: {path}")
+        # Appending cannot be made atomic; keep a single binary append
+        os.makedirs(os.path.dirname(path_str) or ".", exist_ok=True)
+        with open(path_str, "ab") as f:
+            f.write(data)
+        logger.info(f"Successfully wrote to {path}")
+        return
+
+    _write_bytes(path, data, overwrite)
     logger.info(f"Successfully wrote to {path}")
 
 
+def safe_write_many(
+    items: List[Tuple[Path, Union[str, bytes]]], overwrite: bool = False
+) -> List[Tuple[Path, Exception]]:
+    """Write many files in one batch, returning the (path, error) failures"""
+    logger.debug("Batch writing %d files", len(items))
+    failures = []
+    for path, content in items:
+        try:
+            _write_bytes(path, _as_bytes(content), overwrite)
+        except Exception as e:
+            failures.append((path, e))
+    logger.info("Wrote %d of %d files", len(items) - len(failures), len(items))
+    return failures
+
+
+def _as_bytes(content: Union[str, bytes]) -> bytes:
+    """Encode text once as UTF-8; bytes pass through without a copy"""
+    return content.encode("utf-8") if isinstance(content, str) else content
+
+
+def _write_bytes(path: Path, data: bytes, overwrite: bool) -> None:
+    """Write pre-encoded content atomically (overwrite) or exclusively"""
+    path_str = os.fspath(path)
+    if overwrite:
+        _replace_atomically(path_str, data)
+    else:
+        # O_EXCL makes the existence check and the create one syscall
+        try:
+            fd = _open_for_write(path_str, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+        except FileExistsError:
+            logger.error(f"Cannot write: {path} exists and overwrite=False")
+            raise FileExistsError(f"File already exists: {path}") from None
+        try:
+            _write_all(fd, data)
+        finally:
+            os.close(fd)
+
+
+def _replace_atomically(path_str: str, data: bytes) -> None:
+    """Write a unique sibling temp file, then rename it over the target"""
+    # Resolve symlinks so the link is written through rather than replaced
+    target = os.path.realpath(path_str)
+    parent, name = os.path.split(target)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
+    while True:
+        # Created 0o666 like open(), so the kernel applies the umask
+        tmp = os.path.join(parent, f".{name}.{os.urandom(6).hex()}.tmp")
+        try:
+            fd = _open_for_write(tmp, flags)
+            break
+        except FileExistsError:
+            continue
+    try:
+        try:
+            _write_all(fd, data)
+        finally:
+            os.close(fd)
+        # Keep the replaced file's mode; new targets keep the umask default
+        try:
+            shutil.copymode(target, tmp)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _open_for_write(path_str: str, flags: int) -> int:
+    """Open a file descriptor, creating parent directories only when missing"""
+    try:
+        return os.open(path_str, flags, 0o666)
+    except FileNotFoundError:
+        logger.debug("Creating parent directories for %s", path_str)
+        os.makedirs(os.path.dirname(path_str), exist_ok=True)
+        return os.open(path_str, flags, 0o666)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write the whole buffer, looping over short writes"""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
 def relative_path(from_path: Path, to_path: Path) -> Path:
-    logger.debug(f"Computing relative path from {from_path} to {to_path}")
-    result = Path(
-        os.path.relpath(
-            str(to_path), str(from_path.parent if from_path.is_file() else from_path)
-        )
-    ).with_suffix("")
-    logger.debug(f"Relative path result: {result}")
+    logger.debug("Computing relative path from %s to %s", from_path, to_path)
+    base = from_path.parent if from_path.is_file() else from_path
+    rel = os.path.relpath(os.fspath(to_path), os.fspath(base))
+    # Strip the suffix on the string so only one Path is built
+    result = Path(os.path.splitext(rel)[0])
+    logger.debug("Relative path result: %s", result)
     return result
 
 
 def _validate_examples(self, raw_examples: List) -> List[Dict]:
-    logger.debug(f"Validating {len(raw_examples)} examples")
+    logger.debug("Validating %d examples", len(raw_examples))
     valid = []
     for idx, ex in enumerate(raw_examples):
-        logger.debug(f"Processing example {idx}")
         if isinstance(ex, str):
-            logger.debug("Found string example")
             valid.append({"code": ex, "output": None})
         elif isinstance(ex, dict):
             if "content" in ex:  # Legacy format
-                logger.debug("Found legacy format example")
                 valid.append({"code": ex["content"], "output": ex.get("result")})
             elif "code" in ex:
-                logger.debug("Found standard format example")
                 valid.append({"code": str(ex["code"]), "output": ex.get("output")})
             else:
-                logger.warning(f"Skipping invalid example at index {idx}")
+                logger.warning("Skipping invalid example at index %d", idx)
         else:
-            logger.warning(f"Skipping invalid example of type {type(ex).__name__}")
-    logger.info(f"Validated {len(valid)} examples")
+            logger.warning("Skipping invalid example of type %s", type(ex).__name__)
+    logger.info("Validated %d examples", len(valid))
     return valid
@@ -0,0 +1,64 @@
+import copy
+import os
+from pathlib import Path
+
+import astroid
+import pytest
+
+from chewed.config import chewedConfig
+from chewed.formatters.myst_writer import MystWriter
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_astroid():
+    """Pay astroid's one-off brain/builtins load before the first test runs"""
+    astroid.parse("")
+    yield
+    astroid.MANAGER.clear_cache()
+
+
+@pytest.fixture(scope="session")
+def default_config():
+    """Shared default config; tests needing changes should use model_copy()"""
+    return chewedConfig()
+
+
+@pytest.fixture(scope="session")
+def cfg_with_excludes():
+    """Config variant excluding only build/ trees"""
+    return chewedConfig(exclude_patterns=["build/*"])
+
+
+@pytest.fixture(scope="session")
+def myst_writer():
+    """Default-config writer; generate() keeps no per-run state on it"""
+    return MystWriter()
+
+
+@pytest.fixture
+def writer(myst_writer):
+    """Shallow per-test clone for tests that set attributes on the writer"""
+    return copy.copy(myst_writer)
+
+
+@pytest.fixture(scope="session")
+def sample_pkg():
+    """Checked-in minimal local package (tests/fixtures); treat as read-only"""
+    return FIXTURES_DIR / "test_pkg"
+
+
+def _build_pkg(root, files):
+    """Write {relative path: bytes} under root, creating each directory once"""
+    for parent in {os.path.dirname(rel) for rel in files}:
+        os.makedirs(root / parent, exist_ok=True)
+    for rel, data in files.items():
+        (root / rel).write_bytes(data)
+    return root
+
+
+@pytest.fixture(scope="session")
+def build_pkg():
+    """Bulk fixture-tree writer shared by the filesystem tests"""
+    return _build_pkg
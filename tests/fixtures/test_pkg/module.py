@@ -0,0 +1 @@
+def example(): pass
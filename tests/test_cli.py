@@ -1,8 +1,5 @@
-import os
-from pathlib import Path
-import pytest
 from click.testing import CliRunner
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from chewed.cli import cli
 from chewed._version import __version__
 
@@ -22,7 +19,7 @@ def test_cli_local_package(tmp_path):
     pkg_dir = tmp_path / "test_pkg"
     pkg_dir.mkdir()
     (pkg_dir / "__init__.py").touch()
-    (pkg_dir / "module.py").write_text("def test(): pass")
+    (pkg_dir / "module.py").write_bytes(b"def test(): pass")
 
     with patch("chewed.cli.analyze_package") as mock_analyze, patch(
         "chewed.cli.generate_docs"
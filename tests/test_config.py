@@ -3,6 +3,11 @@ from pydantic import ValidationError
 from src.chewed.config import chewedConfig, load_config
 import tomllib
 
+TOML_SRC = """
+[tool.chewed]
+max_example_lines = 20
+"""
+
 
 def test_config_defaults():
     config = chewedConfig()
@@ -21,7 +26,7 @@ def test_config_defaults():
 
 def test_load_invalid_config(tmp_path):
     bad_config = tmp_path / "pyproject.toml"
-    bad_config.write_text("[tool.chewed]\ninvalid_key = 42")
+    bad_config.write_bytes(b"[tool.chewed]\ninvalid_key = 42")
 
     with pytest.raises(ValidationError):
         load_config(bad_config)
@@ -36,18 +41,43 @@ def test_config_validation():
         chewedConfig(theme="invalid_theme")
 
 
-def test_config_from_toml(tmp_path):
-    """Test loading config from TOML file"""
-    config_file = tmp_path / "chewed.toml"
-    config_file.write_text(
-        """
-    [tool.chewed]
-    max_example_lines = 20
-    """
-    )  # Removed invalid theme
-
-    with open(config_file, "rb") as f:
-        config_data = tomllib.load(f)
+def test_config_from_toml():
+    """Test building config from parsed TOML data"""
+    config_data = tomllib.loads(TOML_SRC)
 
     config = chewedConfig(**config_data.get("tool", {}).get("chewed", {}))
     assert config.max_example_lines == 20
+
+
+def test_config_from_toml_file(tmp_path):
+    """Test both file loaders read the same TOML"""
+    config_file = tmp_path / "chewed.toml"
+    config_file.write_bytes(TOML_SRC.encode())
+
+    assert chewedConfig.from_toml(config_file).max_example_lines == 20
+    assert load_config(config_file).max_example_lines == 20
+
+
+def test_exclude_patterns_compiled_matcher():
+    """Test exclude patterns are compiled and follow assignment"""
+    config = chewedConfig(exclude_patterns=["*/build/*"])
+    assert config.exclude_re.match("/src/build/mod.py")
+    assert not config.exclude_re.match("/src/pkg/mod.py")
+
+    config.exclude_patterns = ["*/pkg/*"]
+    assert config.exclude_re.match("/src/pkg/mod.py")
+
+    config.exclude_patterns = []
+    assert not config.exclude_re.match("/src/pkg/mod.py")
+
+
+def test_exclude_matcher_follows_copies():
+    """The matcher tracks model_copy updates and model_construct instances"""
+    config = chewedConfig(exclude_patterns=["*/build/*"])
+    copied = config.model_copy(update={"exclude_patterns": ["*/pkg/*"]})
+    assert copied.exclude_re.match("/src/pkg/mod.py")
+    assert not copied.exclude_re.match("/src/build/mod.py")
+    assert config.exclude_re.match("/src/build/mod.py")
+
+    constructed = chewedConfig.model_construct(exclude_patterns=["*/dist/*"])
+    assert constructed.exclude_re.match("/src/dist/mod.py")
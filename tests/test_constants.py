@@ -1,4 +1,3 @@
-import pytest
 from chewed.constants import (
     TEMPLATE_VERSION,
     DEFAULT_EXCLUSIONS,
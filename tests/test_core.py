@@ -1,8 +1,7 @@
 import astroid
-from astroid import nodes
-import textwrap
+import os
 from pathlib import Path
-from unittest.mock import patch, mock_open
+from unittest.mock import patch
 import pytest
 from chewed.core import analyze_package
 from chewed.module_processor import (
@@ -11,15 +10,39 @@ from chewed.module_processor import (
     _find_imports,
     _get_module_name,
 )
-from chewed.formatters.myst_writer import generate_docs, MystWriter
-from chewed.config import chewedConfig
-import subprocess
+from chewed.formatters.myst_writer import generate_docs
 from chewed.package_discovery import (
     find_python_packages,
     get_package_name,
     _is_namespace_package,
 )
-from chewed.metadata import get_pypi_metadata
+
+# Fixture sources are pure ASCII; write_bytes skips the text-encoding layer
+_INIT_BYTES = b"__version__ = '1.0'\n"
+_PKGUTIL_INIT = b"__path__ = __import__('pkgutil').extend_path(__path__, __name__)\n"
+
+# Import snippets parsed once at collection; _find_imports only reads them
+_INTERNAL_NODE = astroid.parse("from mypkg.sub import mod")
+_EXTERNAL_NODE = astroid.parse("import external.lib")
+_STDLIB_NODE = astroid.parse("import sys\nfrom pathlib import Path\n")
+
+
+class StubCall:
+    """Plain callable for monkeypatch; records calls and returns ``ret``"""
+
+    def __init__(self, ret=None):
+        self.ret = ret
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return self.ret
+
+
+@pytest.fixture(scope="module")
+def doc_processor(default_config):
+    """Example-free processor shared by tests that don't mutate it"""
+    return DocProcessor(config=default_config)
 
 
 def test_get_module_name():
@@ -28,111 +51,87 @@ def test_get_module_name():
     assert _get_module_name(file_path, package_root) == "modules.test"
 
 
+def test_get_module_name_relative_root():
+    """A "." root must not require a literal "./" prefix on the file path"""
+    assert _get_module_name(Path("pkg/mod.py"), Path(".")) == "pkg.mod"
+    assert _get_module_name(Path("pkg/__init__.py"), Path("pkg")) == "pkg"
+
+
 def test_find_imports_internal():
-    code = "from mypkg.sub import mod"
-    node = astroid.parse(code)
-    imports = _find_imports(node, "mypkg")
-    assert any(
-        i["full_path"] == "mypkg.sub.mod" and i["type"] == "internal" for i in imports
-    )
+    imports = {i["full_path"]: i for i in _find_imports(_INTERNAL_NODE, "mypkg")}
+    assert imports.get("mypkg.sub.mod", {}).get("type") == "internal"
 
 
 def test_find_imports_external():
-    code = "import external.lib"
-    node = astroid.parse(code)
-    imports = _find_imports(node, "mypkg")
-    assert any(
-        i["full_path"] == "external.lib" and i["type"] == "external" for i in imports
-    )
+    imports = {i["full_path"]: i for i in _find_imports(_EXTERNAL_NODE, "mypkg")}
+    assert imports.get("external.lib", {}).get("type") == "external"
 
 
 def test_find_imports_stdlib():
-    code = """
-    import sys
-    from pathlib import Path
-    """
-    node = astroid.parse(code)
-    imports = _find_imports(node, "mypkg")
-    assert any(i["full_path"] == "sys" and i["type"] == "stdlib" for i in imports)
-    assert any(
-        i["full_path"] == "pathlib.Path" and i["type"] == "stdlib" for i in imports
-    )
+    imports = {i["full_path"]: i for i in _find_imports(_STDLIB_NODE, "mypkg")}
+    assert imports.get("sys", {}).get("type") == "stdlib"
+    assert imports.get("pathlib.Path", {}).get("type") == "stdlib"
 
 
-def test_analyze_local_package(tmp_path):
-    # Create valid package structure
-    pkg_root = tmp_path / "test_pkg"
-    pkg_root.mkdir()
-    (pkg_root / "__init__.py").write_text("__version__ = '1.0'")
-    module_file = pkg_root / "module.py"
-    module_file.write_text("def example(): pass")
-
-    with patch("chewed.core.process_modules") as mock_process:
-        mock_process.return_value = [{"name": "test_pkg.module"}]
-        result = analyze_package(
-            source=str(pkg_root), is_local=True, config=chewedConfig()
-        )
-        assert len(result["modules"]) >= 1
+def test_analyze_local_package(sample_pkg, default_config, monkeypatch):
+    stub = StubCall([{"name": "test_pkg.module"}])
+    monkeypatch.setattr("chewed.core.process_modules", stub)
+    result = analyze_package(
+        source=str(sample_pkg), is_local=True, config=default_config
+    )
+    assert stub.calls
+    assert len(result["modules"]) >= 1
 
 
 @pytest.mark.xfail(reason="PyPI implementation not complete")
-def test_analyze_pypi_package(tmp_path):
-    with patch("subprocess.run"), patch(
-        "chewed.package_discovery.get_package_name"
-    ) as mock_name, patch("chewed.core.process_modules") as mock_modules, patch(
-        "chewed.metadata._download_pypi_package"
-    ) as mock_download:
-        mock_name.return_value = "testpkg"
-        mock_modules.return_value = [{"name": "testmod"}]
-
-        # Create a mock package path
-        mock_pkg_path = tmp_path / "testpkg"
-        mock_pkg_path.mkdir()
-        (mock_pkg_path / "__init__.py").touch()
-
-        mock_download.return_value = mock_pkg_path
+def test_analyze_pypi_package(tmp_path, default_config, monkeypatch):
+    # Create a mock package path
+    mock_pkg_path = tmp_path / "testpkg"
+    mock_pkg_path.mkdir()
+    (mock_pkg_path / "__init__.py").touch()
+
+    monkeypatch.setattr(
+        "chewed.package_discovery.get_package_name", StubCall("testpkg")
+    )
+    monkeypatch.setattr("chewed.core.process_modules", StubCall([{"name": "testmod"}]))
+    monkeypatch.setattr(
+        "chewed.metadata._download_pypi_package", StubCall(mock_pkg_path)
+    )
 
-        result = analyze_package("testpkg", is_local=False, config=chewedConfig())
-        assert len(result) == 1
-        assert result[0]["name"] == "testmod"
+    result = analyze_package("testpkg", is_local=False, config=default_config)
+    assert len(result) == 1
+    assert result[0]["name"] == "testmod"
 
 
-def test_analyze_empty_package(tmp_path):
+def test_analyze_empty_package(tmp_path, default_config, build_pkg):
     """Test analyzing an empty package"""
-    empty_pkg = tmp_path / "empty_pkg"
-    empty_pkg.mkdir()
-    (empty_pkg / "__init__.py").touch()
+    empty_pkg = build_pkg(tmp_path, {"empty_pkg/__init__.py": b""}) / "empty_pkg"
 
     with pytest.raises(RuntimeError, match="No valid modules found"):
-        analyze_package(empty_pkg, is_local=True, config=chewedConfig())
+        analyze_package(empty_pkg, is_local=True, config=default_config)
 
 
-def test_analyze_invalid_source():
+def test_analyze_invalid_source(default_config):
     """Test analyzing a non-existent source"""
     with pytest.raises(ValueError, match="Source path does not exist"):
-        analyze_package(Path("/non/existent"), is_local=True, config=chewedConfig())
+        analyze_package(Path("/non/existent"), is_local=True, config=default_config)
 
 
-def test_analyze_syntax_error(tmp_path):
+def test_analyze_syntax_error(tmp_path, default_config, build_pkg):
     """Test analyzing a package with syntax errors"""
+    build_pkg(tmp_path, {"test_pkg/__init__.py": b"def invalid_syntax(:"})
     pkg_dir = tmp_path / "test_pkg"
-    pkg_dir.mkdir()
-    (pkg_dir / "__init__.py").write_text("def invalid_syntax(:")
 
     with pytest.raises(RuntimeError, match="No valid modules found"):
-        analyze_package(pkg_dir, is_local=True, config=chewedConfig())
+        analyze_package(pkg_dir, is_local=True, config=default_config)
 
 
-def test_find_python_packages_namespace(tmp_path):
+def test_find_python_packages_namespace(tmp_path, build_pkg, cfg_with_excludes):
     """Test namespace package detection"""
-    pkg_path = tmp_path / "ns_pkg-1.2.3" / "ns_pkg" / "sub"
-    pkg_path.mkdir(parents=True)
-    (pkg_path.parent / "__init__.py").write_text(
-        "__path__ = __import__('pkgutil').extend_path(__path__, __name__)"
-    )
+    os.makedirs(tmp_path / "ns_pkg-1.2.3" / "ns_pkg" / "sub")
+    build_pkg(tmp_path, {"ns_pkg-1.2.3/ns_pkg/__init__.py": _PKGUTIL_INIT})
 
-    config = chewedConfig(exclude_patterns=["build/*"])  # Proper list init
-    packages = find_python_packages(tmp_path, config)
+    packages = find_python_packages(tmp_path, cfg_with_excludes)
     assert len(packages) > 0
 
 
@@ -147,9 +146,7 @@ def test_is_namespace_package(tmp_path):
     pkg_path = tmp_path / "ns_pkg"
     pkg_path.mkdir()
     init_file = pkg_path / "__init__.py"
-    init_file.write_text(
-        "__path__ = __import__('pkgutil').extend_path(__path__, __name__)\n"
-    )
+    init_file.write_bytes(_PKGUTIL_INIT)
     assert _is_namespace_package(pkg_path) is True
 
     # Test PEP 420 namespace (no __init__.py)
@@ -160,19 +157,19 @@ def test_is_namespace_package(tmp_path):
     # Test regular package with non-empty init
     reg_pkg = tmp_path / "regular_pkg"
     reg_pkg.mkdir()
-    (reg_pkg / "__init__.py").write_text("__version__ = '1.0'")
+    (reg_pkg / "__init__.py").write_bytes(_INIT_BYTES)
     assert _is_namespace_package(reg_pkg) is False
 
 
-def test_find_constants():
+@pytest.fixture(scope="module")
+def constants_ast():
+    """Parsed constants module shared by read-only tests"""
+    return astroid.parse("MAX_RETRIES = 3\nDEFAULT_TIMEOUT = 30\n")
+
+
+def test_find_constants(constants_ast, default_config):
     """Test constant extraction with fallback"""
-    code = """
-MAX_RETRIES = 3
-DEFAULT_TIMEOUT = 30
-    """
-    node = astroid.parse(code)
-    config = chewedConfig()
-    constants = _find_constants(node, config)
+    constants = _find_constants(constants_ast, default_config)
     
     # Check for specific constants
     assert "MAX_RETRIES" in constants
@@ -190,18 +187,21 @@ def test_generate_docs_minimal(tmp_path):
     assert (tmp_path / "index.md").exists()
 
 
-def test_analyze_package_error_handling():
+def test_analyze_package_error_handling(default_config):
     with pytest.raises(ValueError, match="Source path does not exist"):
-        analyze_package(source="/non/existent", is_local=True, config=chewedConfig())
+        analyze_package(source="/non/existent", is_local=True, config=default_config)
 
 
-def test_find_python_packages_edge_cases(tmp_path):
-    versioned_path = tmp_path / "pkg-v1.2.3" / "pkg" / "sub"
-    versioned_path.mkdir(parents=True)
-    (versioned_path / "__init__.py").touch()
-    (versioned_path / "module.py").write_text("def test(): pass")
+def test_find_python_packages_edge_cases(tmp_path, default_config, build_pkg):
+    build_pkg(
+        tmp_path,
+        {
+            "pkg-v1.2.3/pkg/sub/__init__.py": b"",
+            "pkg-v1.2.3/pkg/sub/module.py": b"def test(): pass",
+        },
+    )
 
-    config = chewedConfig()
+    config = default_config
     packages = find_python_packages(tmp_path, config)
     pkg_names = [p["name"] for p in packages]
     assert any(
@@ -209,54 +209,40 @@ def test_find_python_packages_edge_cases(tmp_path):
     ), f"Expected pkg.sub in {pkg_names}"
 
 
-def test_example_processing():
-    """Test example processing with different input formats."""
-    processor = DocProcessor(
-        config={},
-        examples=[
-            "print('hello')",
-            {"content": "import os", "result": ""},  # Valid legacy format
-            {"invalid": "format"},  # Should be filtered out
-            123,  # invalid type
-        ],
-    )
-
-    assert len(processor.examples) == 2
-    assert processor.examples[0]["code"] == "print('hello')"
-    assert processor.examples[1]["code"] == "import os"
-
-
-def test_error_handling():
-    """Test invalid example handling."""
-    processor = DocProcessor(config={}, examples=[{"invalid": "format"}, 12345])
-    assert len(processor.examples) == 0
-
-
-def test_edge_case_examples():
-    """Test non-standard but valid example formats."""
-    processor = DocProcessor(
-        config={},
-        examples=[
-            {"content": "import os", "result": ""},  # Legacy format
-            {"code": 42, "output": None},  # Non-string values
-        ],
-    )
-
-    assert len(processor.examples) == 2
-    assert processor.examples[0]["code"] == "import os"
-    assert processor.examples[1]["code"] == "42"
-
-
-def test_config_example_types():
-    """Test config validation handles different example container types"""
-    processor = DocProcessor(config=chewedConfig(), examples="print('valid')")
-    assert len(processor.examples) == 1
-    assert processor.examples[0]["code"] == "print('valid')"
+@pytest.mark.parametrize(
+    "examples,expected_codes",
+    [
+        pytest.param(
+            [
+                "print('hello')",
+                {"content": "import os", "result": ""},  # Valid legacy format
+                {"invalid": "format"},  # Should be filtered out
+                123,  # invalid type
+            ],
+            ["print('hello')", "import os"],
+            id="mixed-formats",
+        ),
+        pytest.param([{"invalid": "format"}, 12345], [], id="all-invalid"),
+        pytest.param(
+            [
+                {"content": "import os", "result": ""},  # Legacy format
+                {"code": 42, "output": None},  # Non-string values
+            ],
+            ["import os", "42"],
+            id="edge-cases",
+        ),
+        pytest.param("print('valid')", ["print('valid')"], id="bare-string"),
+    ],
+)
+def test_example_processing(examples, expected_codes, default_config):
+    """Test example normalization across input formats"""
+    processor = DocProcessor(config=default_config, examples=examples)
+    assert [ex["code"] for ex in processor.examples] == expected_codes
 
 
-def test_myst_writer_error_handling(tmp_path):
+def test_myst_writer_error_handling(tmp_path, myst_writer):
     """Test malformed AST data handling"""
-    writer = MystWriter()
+    writer = myst_writer
     package_info = {
         "package": "testpkg",
         "modules": [
@@ -269,13 +255,13 @@ def test_myst_writer_error_handling(tmp_path):
 
     # Should not raise an error now
     writer.generate(package_info, tmp_path)
-    content = (tmp_path / "broken_mod.md").read_text()
-    assert "## `bad_func()" in content
+    content = (tmp_path / "broken_mod.md").read_bytes()
+    assert b"## `bad_func()" in content
 
 
-def test_process_invalid_module():
+def test_process_invalid_module(doc_processor):
     """Test module processing with invalid AST"""
-    processor = DocProcessor(config=chewedConfig())
+    processor = doc_processor
 
     # Mock the class method directly
     with patch.object(
@@ -1,89 +1,236 @@
-from src.chewed.formatters.myst_writer import MystWriter
-from pathlib import Path
+from src.chewed.formatters.myst_writer import MystWriter, _mermaid_node_name
 import ast
 import pytest
 from chewed.config import chewedConfig
 from chewed.utils import validate_ast
 import logging
+import copy
 
+# Parsed once at import; the formatter tests only read these trees
+_FUNC_AST = ast.parse("def test(a: int, b: str = '') -> bool: pass").body[0]
+_CLASS_AST = ast.parse("class MyClass:\n    def my_method(self):\n        pass\n")
+_METHOD_ARGS = ast.parse("def my_method(self): pass").body[0].args
 
-def test_myst_writer_basic(tmp_path):
-    writer = MystWriter()
-    package_info = {
-        "package": "testpkg",
-        "modules": [{"name": "testmod", "docstrings": {"module": "Test module"}}],
-        "config": {},
-    }
 
-    writer.generate(package_info, tmp_path)
-    index_content = (tmp_path / "index.md").read_text()
+_BASIC_INFO = {
+    "package": "testpkg",
+    "modules": [{"name": "testmod", "docstrings": {"module": "Test module"}}],
+    "config": {},
+}
 
-    assert "testpkg Documentation" in index_content
-    assert "testmod" in index_content
-    assert "```{toctree}" in index_content
+_SIMPLE_INFO = {
+    "package": "testpkg",
+    "modules": [
+        {
+            "name": "testmod",
+            "docstrings": {"module": "Test docs"},
+            "examples": [{"type": "doctest", "content": ">>> 1+1"}],
+        }
+    ],
+}
 
+_COMPLEX_INFO = {
+    "package": "testpkg",
+    "modules": [
+        {
+            "name": "testmod",
+            "docstrings": {
+                "module": "Module doc",
+                "class": "TestClass",
+                "function": "test_func",
+            },
+            "examples": [{"type": "doctest", "content": ">>> 1+1"}],
+            "type_info": {
+                "classes": {
+                    "TestClass": {
+                        "methods": {"__init__": {"args": {"args": [], "defaults": []}}},
+                        "doc": "Class docstring",
+                    },
+                    "EmptyClass": {},
+                },
+                "functions": {
+                    "test_func": {
+                        "args": ast.arguments(args=[ast.arg(arg="param")]),
+                        "returns": ast.Name(id="str"),
+                    }
+                },
+                "cross_references": ["othermod"],
+            },
+        }
+    ],
+}
 
-def test_myst_writer_simple_module(tmp_path):
-    writer = MystWriter()
-    package_info = {
-        "package": "testpkg",
-        "modules": [
-            {
-                "name": "testmod",
-                "docstrings": {"module": "Test docs"},
-                "examples": [{"type": "doctest", "content": ">>> 1+1"}],
-            }
-        ],
-    }
-    writer.generate(package_info, tmp_path)
-    assert (tmp_path / "testmod.md").exists()
 
+_BROKEN_MOD_INFO = {
+    "package": "testpkg",
+    "modules": [
+        {
+            "name": "broken_mod",
+            "type_info": {
+                "functions": {"bad_func": {"args": "invalid", "returns": "str"}}
+            },
+        }
+    ],
+}
 
-def test_myst_writer_complex_module(tmp_path):
-    writer = MystWriter()
-    package_info = {
-        "package": "testpkg",
-        "modules": [
-            {
-                "name": "testmod",
-                "docstrings": {
-                    "module": "Module doc",
-                    "class": "TestClass",
-                    "function": "test_func",
-                },
-                "examples": [{"type": "doctest", "content": ">>> 1+1"}],
-                "type_info": {
-                    "classes": {
-                        "TestClass": {
-                            "methods": {
-                                "__init__": {"args": {"args": [], "defaults": []}}
-                            },
-                            "doc": "Class docstring",
-                        },
-                        "EmptyClass": {},
-                    },
-                    "functions": {
-                        "test_func": {
-                            "args": ast.arguments(args=[ast.arg(arg="param")]),
-                            "returns": ast.Name(id="str"),
-                        }
-                    },
-                    "cross_references": ["othermod"],
-                },
-            }
-        ],
-    }
-    writer.generate(package_info, tmp_path)
-    content = (tmp_path / "testmod.md").read_text()
+_BAD_ARGS_INFO = {
+    "package": "testpkg",
+    "modules": [
+        {
+            "name": "bad_args",
+            "type_info": {
+                "functions": {
+                    "broken_func": {
+                        "args": {"invalid": "structure"},
+                        "returns": "str",
+                    }
+                }
+            },
+        }
+    ],
+}
 
-    assert "## [[TestClass]]" in content
-    assert "Class docstring" in content
-    assert "### `__init__()`" in content
+_VARIABLES_INFO = {
+    "package": "testpkg",
+    "modules": [
+        {
+            "name": "var_module",
+            "type_info": {
+                "variables": {
+                    "STR_VAR": "hello",  # String value
+                    "DICT_VAR": {"value": 42},  # Normal dict format
+                    "INT_VAR": 100,  # Direct value
+                }
+            },
+        }
+    ],
+}
 
+_CONTENT_INFO = {
+    "package": "testpkg",
+    "modules": [
+        {
+            "name": "test_module",
+            "docstrings": {"module": "Test module documentation"},
+            "imports": [
+                {"name": "os", "full_path": "os", "source": ""},
+                {"name": "sys", "full_path": "sys", "source": ""},
+            ],
+            "type_info": {
+                "functions": {
+                    "test_func": {
+                        "doc": "Test function",
+                        "args": ["arg1", "arg2"],
+                        "returns": "str",
+                    }
+                }
+            },
+        }
+    ],
+}
 
-def test_myst_writer_minimal_module(tmp_path):
+_CORE_INFO = {
+    "package": "testpkg",
+    "modules": [
+        {
+            "name": "core",
+            "type_info": {
+                "functions": {
+                    "main": {"args": [], "returns": None, "doc": "Main entry point"}
+                }
+            },
+        }
+    ],
+}
+
+
+@pytest.fixture(scope="module")
+def out_dir(tmp_path_factory):
+    """One output directory for tests whose pages are captured or never read"""
+    return tmp_path_factory.mktemp("formatters")
+
+
+@pytest.fixture
+def pages(monkeypatch):
+    """Capture generate()'s rendered pages by filename instead of hitting disk"""
+    rendered = {}
+
+    def capture(items, overwrite=False):
+        rendered.update((path.name, content) for path, content in items)
+        return []
+
+    monkeypatch.setattr("chewed.formatters.myst_writer.safe_write_many", capture)
+    return rendered
+
+
+@pytest.mark.parametrize(
+    "package_info,filename,expected",
+    [
+        pytest.param(
+            _BASIC_INFO,
+            "index.md",
+            ["testpkg Documentation", "testmod", "```{toctree}"],
+            id="basic",
+        ),
+        # Reading the file is the check: the module page must exist
+        pytest.param(_SIMPLE_INFO, "testmod.md", [], id="simple_module"),
+        pytest.param(
+            _COMPLEX_INFO,
+            "testmod.md",
+            ["## [[TestClass]]", "Class docstring", "### `__init__()`"],
+            id="complex_module",
+        ),
+        pytest.param(
+            _BROKEN_MOD_INFO,
+            "broken_mod.md",
+            ["### `bad_func()`", "*Error: Invalid arguments type"],
+            id="error_handling",
+        ),
+        pytest.param(
+            _BAD_ARGS_INFO,
+            "bad_args.md",
+            ["### `broken_func()`", "*Error: Invalid arguments type"],
+            id="invalid_function_args",
+        ),
+        pytest.param(
+            _VARIABLES_INFO,
+            "var_module.md",
+            [
+                "### Variables",
+                "- `STR_VAR`: hello",
+                "- `DICT_VAR`: 42",
+                "- `INT_VAR`: 100",
+            ],
+            id="variable_formatting",
+        ),
+        pytest.param(
+            _CONTENT_INFO,
+            "test_module.md",
+            ["Test module documentation", "### `test_func(arg1, arg2) -> str`"],
+            id="module_content",
+        ),
+        pytest.param(
+            _CORE_INFO,
+            "core.md",
+            ["# Module: core", "## Functions", "### `main() -> None`"],
+            id="minimal_module_formatting",
+        ),
+    ],
+)
+def test_myst_writer_generate(
+    out_dir, pages, myst_writer, package_info, filename, expected
+):
+    # generate() normalizes examples in place, so hand it a private copy
+    myst_writer.generate(copy.deepcopy(package_info), out_dir)
+    content = pages[filename]
+
+    for snippet in expected:
+        assert snippet in content
+
+
+def test_myst_writer_minimal_module(out_dir, pages, myst_writer):
     """Test module with minimal content"""
-    writer = MystWriter()
+    writer = myst_writer
     package_info = {
         "package": "testpkg",
         "modules": [
@@ -97,37 +244,15 @@ def test_myst_writer_minimal_module(tmp_path):
             }
         ],
     }
-    writer.generate(package_info, tmp_path)
-    content = (tmp_path / "bare_module.md").read_text()
+    writer.generate(package_info, out_dir)
+    content = pages["bare_module.md"]
     assert "## API Reference" not in content
     assert "MAX_LIMIT" in content
 
 
-def test_myst_writer_error_handling(tmp_path):
-    """Test malformed AST data handling"""
-    writer = MystWriter()
-    package_info = {
-        "package": "testpkg",
-        "modules": [
-            {
-                "name": "broken_mod",
-                "type_info": {
-                    "functions": {"bad_func": {"args": "invalid", "returns": "str"}}
-                },
-            }
-        ],
-    }
-
-    writer.generate(package_info, tmp_path)
-    content = (tmp_path / "broken_mod.md").read_text()
-
-    assert "### `bad_func()`" in content
-    assert "*Error: Invalid arguments type" in content
-
-
-def test_myst_writer_invalid_examples(tmp_path, caplog):
+def test_myst_writer_invalid_examples(out_dir, caplog, myst_writer):
     """Test handling of invalid examples in MystWriter"""
-    writer = MystWriter()
+    writer = myst_writer
     package_info = {
         "package": "test_pkg",
         "modules": [
@@ -139,7 +264,7 @@ def test_myst_writer_invalid_examples(tmp_path, caplog):
     }
 
     with caplog.at_level(logging.WARNING):
-        writer.generate(package_info, tmp_path)
+        writer.generate(package_info, out_dir)
     assert "Skipping example: Missing 'code'/'content' field" in caplog.text
 
 
@@ -153,9 +278,9 @@ def test_myst_writer_config_initialization():
     assert writer.config.max_example_lines == 25
 
 
-def test_myst_writer_format_dependencies():
+def test_myst_writer_format_dependencies(myst_writer):
     """Test dependency formatting edge cases"""
-    writer = MystWriter()
+    writer = myst_writer
 
     # Test empty dependencies
     assert "No internal dependencies" in writer._format_dependencies([])
@@ -167,9 +292,9 @@ def test_myst_writer_format_dependencies():
     assert "another_module" in result
 
 
-def test_myst_writer_format_metadata():
+def test_myst_writer_format_metadata(myst_writer):
     """Test metadata formatting with missing fields"""
-    writer = MystWriter()
+    writer = myst_writer
     minimal_data = {"package": "testpkg"}
     result = writer._format_metadata(minimal_data)
 
@@ -178,29 +303,18 @@ def test_myst_writer_format_metadata():
     assert "Unknown Author" in result
 
 
-def test_myst_writer_format_code_structure():
+def test_myst_writer_format_code_structure(myst_writer):
     """Test AST code structure formatting"""
-    writer = MystWriter()
-
-    from textwrap import dedent
+    writer = myst_writer
 
-    code = dedent(
-        """
-    class MyClass:
-        def my_method(self):
-            pass
-    """
-    )
-    tree = ast.parse(code)
-    result = writer._format_code_structure(tree)
+    result = writer._format_code_structure(_CLASS_AST)
 
     assert "Class: MyClass" in result
     assert "Method: my_method" in result
 
 
-def test_myst_writer_format_imports_edge_cases():
+def test_myst_writer_format_imports_edge_cases(writer):
     """Test import formatting with various scenarios"""
-    writer = MystWriter()
     writer.current_module = {"type_info": {}}
     package = "testpkg"
 
@@ -217,9 +331,8 @@ def test_myst_writer_format_imports_edge_cases():
     assert "numpy.array" in result
 
 
-def test_myst_writer_format_module_error_handling():
+def test_myst_writer_format_module_error_handling(writer):
     """Test error handling in module formatting"""
-    writer = MystWriter()
     writer.package_data = {"package": "testpkg"}
 
     result = writer._format_module_content(
@@ -237,9 +350,9 @@ def test_myst_writer_format_module_error_handling():
     assert "*Error: Invalid arguments type" in result
 
 
-def test_myst_writer_example_validation():
+def test_myst_writer_example_validation(myst_writer):
     """Test example formatting with invalid entries"""
-    writer = MystWriter()
+    writer = myst_writer
     examples = [{"invalid": "structure"}, 12345, {"code": "valid = True"}]
 
     result = writer._format_usage_examples(examples)
@@ -247,14 +360,14 @@ def test_myst_writer_example_validation():
     assert "Invalid example" in result
 
 
-def test_myst_writer_class_formatting():
+def test_myst_writer_class_formatting(myst_writer):
     """Test class documentation formatting"""
-    writer = MystWriter()
+    writer = myst_writer
     class_info = {
         "doc": "Class documentation",
         "methods": {
             "my_method": {
-                "args": ast.parse("def my_method(self): pass").body[0].args,
+                "args": _METHOD_ARGS,
                 "doc": "Method docs",
             }
         },
@@ -265,139 +378,26 @@ def test_myst_writer_class_formatting():
     assert "my_method" in result
 
 
-def test_myst_writer_variable_formatting(tmp_path):
-    """Test variable formatting with different data types"""
-    writer = MystWriter()
-    package_info = {
-        "package": "testpkg",
-        "modules": [
-            {
-                "name": "var_module",
-                "type_info": {
-                    "variables": {
-                        "STR_VAR": "hello",  # String value
-                        "DICT_VAR": {"value": 42},  # Normal dict format
-                        "INT_VAR": 100,  # Direct value
-                    }
-                },
-            }
-        ],
-    }
-
-    writer.generate(package_info, tmp_path)
-    content = (tmp_path / "var_module.md").read_text()
-
-    assert "### Variables" in content
-    assert "- `STR_VAR`: hello" in content
-    assert "- `DICT_VAR`: 42" in content
-    assert "- `INT_VAR`: 100" in content
-
-
-def test_myst_writer_invalid_function_args(tmp_path):
-    """Test handling of invalid function arguments"""
-    writer = MystWriter()
-    package_info = {
-        "package": "testpkg",
-        "modules": [
-            {
-                "name": "bad_args",
-                "type_info": {
-                    "functions": {
-                        "broken_func": {
-                            "args": {"invalid": "structure"},
-                            "returns": "str",
-                        }
-                    }
-                },
-            }
-        ],
-    }
-
-    # Should not raise an error
-    writer.generate(package_info, tmp_path)
-    content = (tmp_path / "bad_args.md").read_text()
-    assert "### `broken_func()`" in content
-    assert "*Error: Invalid arguments type" in content
-
-
-def test_format_empty_class():
+def test_format_empty_class(myst_writer):
     """Test class formatting with missing methods"""
-    writer = MystWriter()
+    writer = myst_writer
     result = writer._format_class("EmptyClass", {"doc": "No methods"})
     assert "EmptyClass" in result
     assert "No methods" in result
 
 
-def test_format_function_with_ast_arguments():
+def test_format_function_with_ast_arguments(myst_writer):
     """Test function formatting with real AST arguments"""
-    writer = MystWriter()
-    func_ast = ast.parse("def test(a: int, b: str = '') -> bool: pass").body[0]
-
+    writer = myst_writer
     result = writer._format_function(
         "test",
-        {"args": func_ast.args, "returns": func_ast.returns, "doc": "Test function"},
+        {"args": _FUNC_AST.args, "returns": _FUNC_AST.returns, "doc": "Test function"},
     )
 
     assert "test(a: int, b: str = '') -> bool" in result
     assert "Test function" in result
 
 
-def test_module_content_generation(tmp_path):
-    """Test complete module content generation"""
-    writer = MystWriter()
-    module_data = {
-        "name": "test_module",
-        "docstrings": {"module": "Test module documentation"},
-        "imports": [
-            {"name": "os", "full_path": "os", "source": ""},
-            {"name": "sys", "full_path": "sys", "source": ""},
-        ],
-        "type_info": {
-            "functions": {
-                "test_func": {
-                    "doc": "Test function",
-                    "args": ["arg1", "arg2"],
-                    "returns": "str",
-                }
-            }
-        },
-    }
-
-    package_data = {"package": "testpkg", "modules": [module_data]}
-
-    writer.generate(package_data, tmp_path)
-    test_file = tmp_path / "test_module.md"
-    content = test_file.read_text()
-
-    assert "Test module documentation" in content
-    assert "### `test_func(arg1, arg2) -> str`" in content
-
-
-def test_minimal_module_formatting(tmp_path):
-    """Test formatting of minimal module data"""
-    writer = MystWriter()
-    package_data = {
-        "package": "testpkg",
-        "modules": [
-            {
-                "name": "core",
-                "type_info": {
-                    "functions": {
-                        "main": {"args": [], "returns": None, "doc": "Main entry point"}
-                    }
-                },
-            }
-        ],
-    }
-
-    writer.generate(package_data, tmp_path)
-    content = (tmp_path / "core.md").read_text()
-
-    assert "# Module: core" in content
-    assert "## Functions" in content
-    assert "### `main() -> None`" in content
-
-
 def test_validate_ast_with_errors():
     """Test AST validation with invalid assignments"""
     # Test valid empty module
@@ -416,16 +416,66 @@ def test_validate_ast_with_errors():
         validate_ast(invalid_tree)
 
 
-def test_myst_writer_path_sanitization(tmp_path):
+def test_myst_writer_generate_writes_to_disk(tmp_path, myst_writer):
+    """generate() writes every page through the real batch writer"""
+    package_info = {
+        "package": "testpkg",
+        "modules": [
+            {"name": "pkg.alpha", "docstrings": {"Module:module": "Alpha docs"}},
+            {"name": "pkg.beta", "docstrings": {"Module:module": "Beta docs"}},
+        ],
+    }
+    (tmp_path / "pkg_beta.md").write_bytes(b"stale")
+
+    myst_writer.generate(package_info, tmp_path)
+
+    assert b"Alpha docs" in (tmp_path / "pkg_alpha.md").read_bytes()
+    # Existing pages are replaced, and no temp files are left behind
+    assert b"Beta docs" in (tmp_path / "pkg_beta.md").read_bytes()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "pkg_alpha.md",
+        "pkg_beta.md",
+    ]
+
+
+def test_myst_writer_generate_logs_only_written_pages(
+    tmp_path, myst_writer, monkeypatch, caplog
+):
+    """A page is reported as generated only after its write succeeds"""
+    package_info = {"modules": [{"name": "pkg.alpha"}, {"name": "pkg.beta"}]}
+
+    def fail_beta(items, overwrite=False):
+        return [
+            (path, OSError("disk full")) for path, _ in items if "beta" in path.name
+        ]
+
+    monkeypatch.setattr("chewed.formatters.myst_writer.safe_write_many", fail_beta)
+    with caplog.at_level(logging.DEBUG, logger="chewed.formatters.myst_writer"):
+        myst_writer.generate(package_info, tmp_path)
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert "Generated pkg_alpha.md" in messages
+    assert "Generated pkg_beta.md" not in messages
+    assert "Error generating pkg_beta.md: disk full" in messages
+
+def test_myst_writer_path_sanitization(tmp_path, myst_writer):
     """Test path sanitization in MystWriter"""
-    writer = MystWriter()
+    writer = myst_writer
     package_info = {
         "package": "test/pkg",
         "modules": [{"name": "test.module", "docstring": "Test module"}],
     }
 
     writer.generate(package_info, tmp_path)
-    expected_path = tmp_path / "test_module.md"
-    assert expected_path.exists()
-    content = expected_path.read_text()
-    assert "Test module" in content
+    # read_bytes() doubles as the existence check
+    content = (tmp_path / "test_module.md").read_bytes()
+    assert b"Test module" in content
+
+
+def test_dependency_node_names_cached_across_writers():
+    """Node-name sanitization is memoized at module level, not per writer"""
+    _mermaid_node_name.cache_clear()
+    assert MystWriter()._clean_node_name("my.dep-mod") == "my_dep_mod"
+    assert MystWriter()._clean_node_name("my.dep-mod") == "my_dep_mod"
+    info = _mermaid_node_name.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
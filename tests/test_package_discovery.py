@@ -1,38 +1,43 @@
-from chewed.config import chewedConfig
-from chewed.package_discovery import find_python_packages, _is_namespace_package
-from pathlib import Path
-import pytest
+from chewed.package_discovery import (
+    find_python_packages,
+    _is_package,
+)
 import os
 
 
-def test_find_packages_with_symlinks(tmp_path):
+def test_find_packages_with_symlinks(tmp_path, default_config, build_pkg):
     """Test package discovery with symlinks"""
     # Create original package
-    pkg_dir = tmp_path / "original_pkg"
-    pkg_dir.mkdir()
-    (pkg_dir / "__init__.py").touch()
-    (pkg_dir / "module.py").write_text("def test(): pass")
+    build_pkg(
+        tmp_path,
+        {
+            "original_pkg/__init__.py": b"",
+            "original_pkg/module.py": b"def test(): pass",
+        },
+    )
 
     # Create symlink
-    link_dir = tmp_path / "linked_pkg"
-    os.symlink(pkg_dir, link_dir)
+    os.symlink(tmp_path / "original_pkg", tmp_path / "linked_pkg")
 
-    config = chewedConfig()
+    config = default_config
     packages = find_python_packages(tmp_path, config)
 
     # Should only find one package (deduplicate symlinks)
     assert len([p for p in packages if p["name"] == "original_pkg"]) == 1
 
 
-def test_find_python_packages_with_errors(tmp_path):
+def test_find_python_packages_with_errors(tmp_path, default_config, build_pkg):
     """Test package discovery with problematic files"""
-    pkg_dir = tmp_path / "test_pkg"
-    pkg_dir.mkdir()
-    (pkg_dir / "__init__.py").touch()
-    (pkg_dir / "good.py").write_text("def test(): pass")
-    (pkg_dir / "bad.py").write_text("invalid python code {")
+    build_pkg(
+        tmp_path,
+        {
+            "test_pkg/__init__.py": b"",
+            "test_pkg/good.py": b"def test(): pass",
+            "test_pkg/bad.py": b"invalid python code {",
+        },
+    )
 
-    config = chewedConfig()
+    config = default_config
     packages = find_python_packages(tmp_path, config)
 
     # Should find the package and good module despite the bad one
@@ -40,3 +45,46 @@ def test_find_python_packages_with_errors(tmp_path):
     names = [p["name"] for p in packages]
     assert "test_pkg" in names
     assert "test_pkg.good" in names
+
+
+def test_is_package_detection(tmp_path, default_config, build_pkg):
+    """Test package detection with and without __init__.py"""
+    build_pkg(tmp_path, {"reg_pkg/__init__.py": b"", "ns_pkg/module.py": b""})
+    reg_pkg = tmp_path / "reg_pkg"
+    ns_pkg = tmp_path / "ns_pkg"
+
+    config = default_config
+    assert _is_package(reg_pkg, config) is True
+    assert _is_package(ns_pkg, config) is False
+    assert _is_package(reg_pkg / "__init__.py", config) is False
+
+    # default_config is session-shared, so flip the flag on a copy
+    config = default_config.model_copy(update={"allow_namespace_packages": True})
+    assert _is_package(ns_pkg, config) is True
+
+
+def test_find_packages_skips_hidden_and_vendored_trees(
+    tmp_path, default_config, build_pkg
+):
+    """Test discovery does not descend into virtualenvs or hidden dirs"""
+    files = {"mypkg/__init__.py": b"", "mypkg/core.py": b"x = 1"}
+    for skipped in ("venv/lib", ".tox/py311", "mypkg/__pycache__"):
+        files[f"{skipped}/vendored.py"] = b"y = 2"
+    build_pkg(tmp_path, files)
+
+    packages = find_python_packages(tmp_path, default_config)
+
+    names = {p["name"] for p in packages}
+    assert names == {"mypkg", "mypkg.core"}
+
+
+def test_find_packages_flat_layout_has_no_duplicates(
+    tmp_path, default_config, build_pkg
+):
+    """Test a flat single-package root yields each module exactly once"""
+    build_pkg(tmp_path, {"__init__.py": b"", "a.py": b"x = 1", "b.py": b"y = 2"})
+
+    packages = find_python_packages(tmp_path, default_config)
+
+    names = [p["name"] for p in packages]
+    assert sorted(names) == ["a", "b"]
@@ -0,0 +1,47 @@
+from chewed.relationships import analyze_relationships
+
+
+def test_analyze_relationships_graph():
+    modules = [
+        {
+            "name": "pkg.core",
+            "internal_deps": ["pkg.utils", "other.mod"],
+            "imports": [
+                {"type": "external", "source": "requests"},
+                {"type": "stdlib", "full_path": "os"},
+                {"type": "internal", "source": "pkg"},
+                "not-a-dict",
+            ],
+        },
+        {"name": "pkg.utils", "imports": [{"type": "external", "source": "requests"}]},
+    ]
+
+    result = analyze_relationships(modules, "pkg")
+
+    assert result["dependency_graph"] == {
+        "pkg.core": ["pkg.utils", "external:requests", "stdlib:os"],
+        "pkg.utils": ["external:requests"],
+    }
+    assert result["external_deps"] == ["requests"]
+
+
+def test_analyze_relationships_shares_dependency_labels():
+    modules = [
+        {"name": name, "imports": [{"type": "external", "source": "click"}]}
+        for name in ("a", "b")
+    ]
+
+    graph = analyze_relationships(modules, "pkg")["dependency_graph"]
+
+    assert graph["a"][0] is graph["b"][0]
+
+
+def test_analyze_relationships_external_deps_order():
+    modules = [
+        {"name": "a", "imports": [{"type": "external", "source": s}]}
+        for s in ("zlib_ext", "attrs", "zlib_ext", "click")
+    ]
+
+    result = analyze_relationships(modules, "pkg")
+
+    assert result["external_deps"] == ["zlib_ext", "attrs", "click"]
@@ -0,0 +1,90 @@
+import os
+import pytest
+from chewed.stats import StatsCollector
+
+
+@pytest.fixture
+def project_tree(tmp_path):
+    """Create a minimal project layout for stats collection"""
+    src_dir = tmp_path / "project" / "chewed"
+    os.makedirs(src_dir)
+    (src_dir / "constants.py").write_bytes(
+        b"MAX_SIZE = 10\nDEFAULT_NAME = 'x'\nlower_case = 1\n"
+    )
+    (src_dir / "config.py").write_bytes(b"class chewedConfig:\n    pass\n")
+    (src_dir / "cli.py").write_bytes(
+        b"@cli.command()\n@click.option('--x')\n"
+        b"@click.argument('src')\ndef run(): ...\n"
+    )
+    formatters_dir = src_dir / "formatters"
+    formatters_dir.mkdir()
+    (formatters_dir / "writer.py").write_bytes(
+        b"def _format_example(): pass\ndef _validate_example(): pass\n"
+    )
+    tests_dir = tmp_path / "tests"
+    tests_dir.mkdir()
+    (tests_dir / "test_sample.py").write_bytes(
+        b"def test_one():\n    assert 1\n\ndef test_two():\n    assert 2\n"
+    )
+    return tmp_path / "project"
+
+
+def test_analyze_project_counts(project_tree):
+    collector = StatsCollector()
+    collector.analyze_project(project_tree)
+
+    metrics = collector.metrics
+    assert metrics["constants"]["count"] == 2
+    assert metrics["config"]["options"] == 1
+    assert metrics["tests"] == {"cases": 2, "assertions": 2}
+    assert metrics["cli"] == {"commands": 1, "options": 1, "arguments": 1}
+    assert metrics["examples"]["total"] == 2
+
+
+def test_analyze_project_missing_files(tmp_path):
+    collector = StatsCollector()
+    collector.analyze_project(tmp_path)
+
+    assert collector.metrics["constants"]["count"] == 0
+    assert collector.metrics["tests"]["cases"] == 0
+
+
+def test_analyze_constants_counts_assign_statements(tmp_path):
+    const_file = tmp_path / "constants.py"
+    const_file.write_bytes(
+        b"TOP = 1\nA = B = 2\nTYPED: int = 3\nlower = 4\n"
+        b"def f():\n    LOCAL = 5\n\n"
+        b'DOC = """\nFAKE = 6\n"""\n'
+    )
+
+    collector = StatsCollector()
+    collector._analyze_constants(const_file)
+
+    # One per top-level ALL_CAPS Assign statement; assignments inside
+    # functions, annotated assignments and look-alike string lines do not count
+    assert collector.metrics["constants"]["count"] == 3
+
+
+def test_analyze_config_ignores_mentions_in_strings(tmp_path):
+    config_file = tmp_path / "config.py"
+    config_file.write_bytes(
+        b'"""\nclass chewedConfig:\n"""\n'
+        b"class chewedConfig:\n    pass\n"
+    )
+
+    collector = StatsCollector()
+    collector._analyze_config(config_file)
+
+    assert collector.metrics["config"]["options"] == 1
+
+
+def test_analyze_project_unreadable_dir_warns(project_tree, monkeypatch, caplog):
+    def deny(path):
+        raise PermissionError(13, "Permission denied", str(path))
+
+    monkeypatch.setattr("chewed.stats.os.scandir", deny)
+    collector = StatsCollector()
+    collector.analyze_project(project_tree)
+
+    assert collector.metrics["tests"]["cases"] == 0
+    assert "Cannot list" in caplog.text
@@ -2,12 +2,38 @@ from src.chewed.utils import safe_write
 import pytest
 from pathlib import Path
 import ast
-from src.chewed.config import chewedConfig
+import logging
+import os
 from src.chewed.utils import (
     format_function_signature,
     extract_constant_values,
     validate_ast,
     get_annotation,
+    relative_path,
+    infer_responsibilities,
+)
+
+_SIG_FUNC = ast.parse("def _(x, y) -> float: pass").body[0]
+
+# Hand-built invalid trees; validate_ast only reads them, so one copy serves
+_BAD_DICT_MODULE = ast.Module(
+    body=[
+        ast.Expr(
+            value=ast.Dict(
+                keys=[ast.Constant(value=1), ast.Constant(value=2)],
+                values=[ast.Constant(value=3)],  # 2 keys, 1 value
+            )
+        )
+    ]
+)
+_BAD_ASSIGN_MODULE = ast.Module(
+    body=[
+        ast.Assign(
+            targets=[ast.Constant(value=123)],  # Invalid target
+            value=ast.Constant(value="invalid"),
+        )
+    ],
+    type_ignores=[],
 )
 
 
@@ -32,36 +58,124 @@ def test_safe_write_overwrite(tmp_path):
     assert test_file.read_text() == "new content"
 
 
-def test_format_function_signature():
-    args = ast.arguments(args=[ast.arg(arg="x"), ast.arg(arg="y")])
-    returns = ast.Name(id="float")
-    config = chewedConfig()
-    sig = format_function_signature(args, returns, config=config)
+def test_safe_write_atomic(tmp_path):
+    target = tmp_path / "nested" / "dir" / "page.md"
+    safe_write(target, "first")
+    safe_write(target, "second", overwrite=True)
+    assert target.read_text() == "second"
+    assert [p.name for p in target.parent.iterdir()] == ["page.md"]
+
+
+def test_safe_write_bytes_and_append(tmp_path):
+    target = tmp_path / "data.bin"
+    safe_write(target, b"\x00\xff")
+    with pytest.raises(FileExistsError):
+        safe_write(target, "é", mode="a")
+    safe_write(target, "é", mode="a", overwrite=True)
+    assert target.read_bytes() == b"\x00\xff" + "é".encode("utf-8")
+
+
+def test_safe_write_overwrite_keeps_mode_and_symlink(tmp_path):
+    real = tmp_path / "real.md"
+    real.write_bytes(b"old")
+    real.chmod(0o640)
+    link = tmp_path / "link.md"
+    link.symlink_to(real)
+    # A stray file named like the old fixed temp path must survive
+    bystander = tmp_path / "real.md.tmp"
+    bystander.write_bytes(b"keep")
+
+    safe_write(link, "new", overwrite=True)
+
+    assert link.is_symlink()
+    assert real.read_bytes() == b"new"
+    assert real.stat().st_mode & 0o777 == 0o640
+    assert bystander.read_bytes() == b"keep"
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "link.md",
+        "real.md",
+        "real.md.tmp",
+    ]
+
+
+def test_safe_write_overwrite_new_file_uses_umask(tmp_path):
+    target = tmp_path / "sub" / "new.md"
+    old_umask = os.umask(0o027)
+    try:
+        safe_write(target, "new", overwrite=True)
+    finally:
+        os.umask(old_umask)
+
+    assert target.read_bytes() == b"new"
+    assert target.stat().st_mode & 0o777 == 0o640
+    assert [p.name for p in target.parent.iterdir()] == ["new.md"]
+
+def test_safe_write_overwrite_cleans_up_on_failure(tmp_path, monkeypatch):
+    target = tmp_path / "page.md"
+    target.write_bytes(b"old")
+
+    def fail(src, dst):
+        raise OSError("replace failed")
+
+    monkeypatch.setattr("src.chewed.utils.os.replace", fail)
+    with pytest.raises(OSError, match="replace failed"):
+        safe_write(target, "new", overwrite=True)
+
+    assert target.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["page.md"]
+
+
+def test_safe_write_many(tmp_path):
+    from src.chewed.utils import safe_write_many
+
+    existing = tmp_path / "a" / "keep.md"
+    existing.parent.mkdir()
+    existing.write_text("old")
+    items = [(tmp_path / "a" / f"m{i}.md", f"module {i}") for i in range(5)]
+    items.append((existing, "new"))
+
+    failures = safe_write_many(items)
+    assert [path for path, _ in failures] == [existing]
+    assert isinstance(failures[0][1], FileExistsError)
+    assert (tmp_path / "a" / "m3.md").read_text() == "module 3"
+
+    assert safe_write_many(items, overwrite=True) == []
+    assert existing.read_text() == "new"
+
+
+def test_format_function_signature(default_config):
+    config = default_config
+    sig = format_function_signature(_SIG_FUNC.args, _SIG_FUNC.returns, config=config)
     assert sig == "(x, y) -> float"
 
 
+def test_format_function_signature_defaults(default_config):
+    func = ast.parse("def f(a, b=1, c=True, d=1.0, e=None, f=[1]): pass").body[0]
+    sig = format_function_signature(func.args, None, config=default_config)
+    assert sig == "(a, b = 1, c = True, d = 1.0, e = None, f = [1])"
+
+
 def test_extract_constant_values():
     node = ast.parse("MAX_LENGTH = 100\nAPI_URL = 'https://example.com'")
     constants = extract_constant_values(node)
     assert ("MAX_LENGTH", "100") in constants
     assert ("API_URL", "'https://example.com'") in constants
 
+    chained = extract_constant_values(ast.parse("A = B = 1\nc = 2\nD, E = 3, 4"))
+    assert chained == [("A", "1"), ("B", "1")]
+
+
+def test_debug_logging_enabled_after_import(caplog):
+    """Per-node debug lines follow logging configured after import"""
+    with caplog.at_level(logging.DEBUG):
+        extract_constant_values(ast.parse("MAX = 1"))
+    assert "Found constants: MAX = 1" in caplog.text
+
 
 def test_validate_ast_invalid_nodes():
     """Test AST validation with key/value mismatch"""
-    bad_node = ast.Module(
-        body=[
-            ast.Expr(
-                value=ast.Dict(
-                    keys=[ast.Constant(value=1), ast.Constant(value=2)],
-                    values=[ast.Constant(value=3)],  # 2 keys, 1 value
-                )
-            )
-        ]
-    )
-
     with pytest.raises(ValueError) as exc_info:
-        validate_ast(bad_node)
+        validate_ast(_BAD_DICT_MODULE)
     assert "key/value count mismatch" in str(exc_info.value)
     assert "2 keys vs 1 values" in str(exc_info.value)
 
@@ -72,25 +186,98 @@ def test_validate_ast_empty_with_docstring():
     validate_ast(node)  # Should not raise
 
 
-def test_get_annotation_complex():
+def test_get_annotation_complex(default_config):
     """Test annotation formatting with complex types"""
-    node = ast.parse("def f() -> Dict[str, List[int]]: pass").body[0].returns
-    result = get_annotation(node, chewedConfig())
+    node = ast.parse("Dict[str, List[int]]", mode="eval").body
+    result = get_annotation(node, default_config)
     assert "Dict[str, List[int]]" in result
 
 
+def test_get_annotation_cached(default_config):
+    """Repeated annotations are simplified once and served from the cache"""
+    from src.chewed.utils import _simplify_annotation_str
+
+    _simplify_annotation_str.cache_clear()
+    config = default_config
+    for _ in range(3):
+        node = ast.parse("x: typing.Optional[os.PathLike]").body[0].annotation
+        assert get_annotation(node, config) == "Optional[PathLike]"
+    info = _simplify_annotation_str.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
+
+
 def test_validate_ast_with_errors():
     """Test AST validation with invalid assignments"""
     # Valid empty module should pass
     validate_ast(ast.parse(""))
 
-    # Create invalid AST structure directly
-    invalid_node = ast.Assign(
-        targets=[ast.Constant(value=123)],  # Invalid target
-        value=ast.Constant(value="invalid"),
-    )
-    invalid_tree = ast.Module(body=[invalid_node], type_ignores=[])
-
     with pytest.raises(ValueError) as excinfo:
-        validate_ast(invalid_tree)
+        validate_ast(_BAD_ASSIGN_MODULE)
     assert "Invalid assignment target" in str(excinfo.value)
+
+
+def test_validate_ast_nested_assignment():
+    """Bad assignment targets are caught inside nested statements"""
+    code = "def f():\n    if x:\n        y = {1: 2}\n"
+    tree = ast.parse(code)
+    validate_ast(tree)
+
+    tree.body[0].body[0].body[0].targets = [ast.Constant(value=1)]
+    with pytest.raises(ValueError, match="Invalid assignment target"):
+        validate_ast(tree)
+
+
+def test_relative_path(tmp_path):
+    """Test relative path computation strips the target suffix"""
+    src_file = tmp_path / "docs" / "index.md"
+    src_file.parent.mkdir()
+    src_file.touch()
+
+    assert relative_path(src_file, tmp_path / "api" / "mod.md") == Path("../api/mod")
+    assert relative_path(tmp_path, tmp_path / "pkg" / "mod.py") == Path("pkg/mod")
+    # Dotted directory names are still directories
+    dotted = tmp_path / "pkg.v2"
+    dotted.mkdir()
+    assert relative_path(dotted, tmp_path / "api.md") == Path("../api")
+    # Same directory yields "." rather than failing on an empty name
+    assert relative_path(tmp_path, tmp_path) == Path(".")
+    # A source that does not exist is treated as a directory
+    missing = tmp_path / "build"
+    assert relative_path(missing, tmp_path / "build" / "x.md") == Path("x")
+
+
+def test_infer_responsibilities():
+    """Test responsibility summary truncates long name lists"""
+    module = {
+        "classes": [{"name": f"Class{i}"} for i in range(5)],
+        "functions": {"run": {"name": "run"}, "anon": {}},
+    }
+    result = infer_responsibilities(module)
+    assert "Defines core classes: Class0, Class1, Class2 (+2 more)" in result
+    assert result.endswith("- Provides key functions: run")
+    assert "constants" not in result
+
+    mixed = infer_responsibilities({"constants": [{"name": "MAX"}, "junk", {}]})
+    assert mixed.endswith("- Contains constants: MAX")
+
+    assert infer_responsibilities({}) == (
+        "General utility module with mixed responsibilities"
+    )
+
+
+def test_find_imports_nested_statements():
+    from src.chewed.utils import _find_imports
+
+    code = (
+        "import os\n"
+        "if TYPE_CHECKING:\n    from typing import Any\n"
+        "try:\n    import ujson as json\nexcept ImportError:\n    import json\n"
+        "def f():\n    from . import sibling\n    return lambda: os\n"
+    )
+    assert _find_imports(ast.parse(code)) == [
+        "os",
+        "typing.Any",
+        "ujson",
+        "json",
+        "sibling",
+    ]